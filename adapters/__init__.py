@@ -12,10 +12,13 @@ from adapters.tefas import (
 
 from adapters.yfinance_stocks import (
     fetch_stock_prices,
+    fetch_stock_prices_bulk,
     update_stock_prices,
+    update_stock_prices_bulk,
     fetch_prices_for_new_stock,
     get_current_stock_price,
     is_valid_stock,
+    is_valid_stocks,
     get_stock_info,
 )
 
@@ -28,9 +31,12 @@ __all__ = [
     "is_valid_tefas_fund",
     # yfinance stocks
     "fetch_stock_prices",
+    "fetch_stock_prices_bulk",
     "update_stock_prices",
+    "update_stock_prices_bulk",
     "fetch_prices_for_new_stock",
     "get_current_stock_price",
     "is_valid_stock",
+    "is_valid_stocks",
     "get_stock_info",
 ]
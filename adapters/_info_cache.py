@@ -0,0 +1,125 @@
+"""
+Caching helpers for the yfinance adapter.
+
+- FileCache: JSON-file TTL cache for slow-changing metadata. `yf.Ticker(...).info`
+  scrapes and parses a large payload on every access, while fields like name,
+  currency and exchange rarely change. Entries survive application restarts.
+- ttl_lru_cache: in-process LRU whose entries expire after a short TTL.
+"""
+
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable
+
+from core.log import get_logger
+
+try:
+    # orjson ships with gradio; it parses the ~100 KB info payloads several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = get_logger("info_cache")
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FileCache:
+    """JSON-file cache where each entry expires after `ttl_seconds`."""
+
+    def __init__(self, directory: str | Path, ttl_seconds: int = 86400):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.json"
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for key, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = _loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("ts", 0) >= self.ttl_seconds:
+            return None
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key. Failures are logged and otherwise ignored."""
+        path = self._path(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps({"ts": time.time(), "value": value}))
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write cache entry for {key}: {e}")
+
+
+def cached(cache: FileCache, key: Callable[..., str]) -> Callable:
+    """
+    Decorator that serves results from `cache`, keyed by `key(*args)`.
+
+    Empty results (None, {}) are not stored so that transient failures are retried.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            value = cache.get(cache_key)
+            if value is not None:
+                return value
+
+            value = func(*args, **kwargs)
+            if value:
+                cache.set(cache_key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def ttl_lru_cache(maxsize: int = 128, ttl: int = 60) -> Callable:
+    """
+    functools.lru_cache whose entries expire after roughly `ttl` seconds.
+
+    A time bucket (time.monotonic() // ttl) is passed as a hidden first argument,
+    so entries from a previous bucket are never hit again and age out of the LRU.
+    The wrapper exposes cache_clear() and cache_info() like lru_cache.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @lru_cache(maxsize=maxsize)
+        def cached_func(_bucket: int, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return cached_func(int(time.monotonic() // ttl), *args, **kwargs)
+
+        wrapper.cache_clear = cached_func.cache_clear
+        wrapper.cache_info = cached_func.cache_info
+        return wrapper
+
+    return decorator
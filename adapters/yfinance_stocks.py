@@ -6,22 +6,121 @@ and stores them in the database. Uses INSERT OR IGNORE to avoid updating existin
 """
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import repeat
 
 import pandas as pd
+from pandas.tseries.offsets import BDay
 import yfinance as yf
+from curl_cffi import requests as curl_requests
 
+from adapters._info_cache import FileCache, cached, ttl_lru_cache
 from core.log import get_logger
 
 from core.database import (
     CURRENCY_USD,
     bulk_add_fund_prices,
+    bulk_add_fund_prices_by_ticker,
     get_fund_price_date_range,
+    get_fund_price_dates,
     get_latest_fund_price,
 )
 
 logger = get_logger("yfinance")
 
 
+@lru_cache(maxsize=256)
+def _normalize_ticker(ticker: str) -> str:
+    """Canonical ticker form used for API calls and DB keys (memoized: the same few symbols repeat)."""
+    return ticker.upper().strip()
+
+
+@lru_cache(maxsize=1)
+def _get_session() -> curl_requests.Session:
+    """
+    Shared HTTP session for all yfinance calls so connections are kept alive
+    and reused instead of paying a TCP+TLS handshake per Ticker.
+    yfinance requires a curl_cffi session (it is already a yfinance dependency).
+    """
+    return curl_requests.Session(impersonate="chrome")
+
+
+def _ticker(ticker: str) -> yf.Ticker:
+    """Create a yf.Ticker bound to the shared session."""
+    return yf.Ticker(ticker, session=_get_session())
+
+
+# Ticker metadata (name, currency, exchange) changes rarely - keep it for a day
+_info_cache = FileCache(".cache/yf_info", ttl_seconds=86400)
+
+
+def _info_key(ticker: str) -> str:
+    """File-cache key for a ticker's info dict."""
+    return f"info:{_normalize_ticker(ticker)}"
+
+
+@cached(_info_cache, key=_info_key)
+def _fetch_info(ticker: str) -> dict:
+    """Fetch the yfinance info dict for a ticker, served from the file cache when fresh."""
+    return dict(_ticker(_normalize_ticker(ticker)).info)
+
+
+def _new_rows(ticker: str, data: pd.DataFrame) -> tuple[list[tuple[str, str, float]], int]:
+    """
+    Build (date, ticker, price) rows from the Close column of a yfinance history frame,
+    leaving out dates that are already stored.
+
+    Returns:
+        Tuple of (new rows, count of dates already stored)
+    """
+    # Drop dates we already store (one hashed isin instead of letting every row hit the DB)
+    date_index = data.index.strftime("%Y-%m-%d")
+    existing = get_fund_price_dates(ticker, date_index.min(), date_index.max())
+    new_mask = ~date_index.isin(existing)
+    already_stored = int((~new_mask).sum())
+
+    # Use Close price - build (date, ticker, price) rows column-wise instead of per-row Series
+    dates = date_index[new_mask].tolist()
+    closes = data["Close"].to_numpy(dtype="float64")[new_mask].tolist()
+    return list(zip(dates, repeat(ticker, len(dates)), closes)), already_stored
+
+
+def _store_history(ticker: str, data: pd.DataFrame, start_date: str, end_date: str) -> tuple[int, int, str]:
+    """
+    Store the Close column of a yfinance history frame for one ticker.
+    Dates already in the database are skipped.
+
+    Args:
+        ticker: Normalized ticker symbol
+        data: yfinance history frame (DatetimeIndex, 'Close' column)
+        start_date: Requested start date (for messages)
+        end_date: Requested end date (for messages)
+
+    Returns:
+        Tuple of (inserted_count, skipped_count, status_message)
+    """
+    if data.empty:
+        logger.warning(f"No data found for {ticker} between {start_date} and {end_date}")
+        return 0, 0, f"⚠️ No data found for {ticker} between {start_date} and {end_date}"
+
+    all_prices, already_stored = _new_rows(ticker, data)
+
+    if not all_prices:
+        logger.info(f"All {already_stored} prices for {ticker} already stored")
+        return 0, already_stored, f"✅ {ticker}: 0 new prices added, {already_stored} already existed"
+
+    logger.info(f"Collected {len(all_prices)} new prices for {ticker}, bulk inserting...")
+    # Bulk insert all collected prices with USD currency
+    inserted, skipped = bulk_add_fund_prices(all_prices, source="yfinance", currency=CURRENCY_USD)
+    skipped += already_stored
+    logger.info(f"yfinance fetch completed for {ticker}: {inserted} inserted, {skipped} skipped")
+    if inserted > 0:
+        # New prices may change the latest price - drop memoized lookups
+        _get_current_stock_price.cache_clear()
+
+    return inserted, skipped, f"✅ {ticker}: {inserted} new prices added, {skipped} already existed"
+
+
 def fetch_stock_prices(
     ticker: str,
     start_date: str | None = None,
@@ -41,7 +140,7 @@ def fetch_stock_prices(
     Returns:
         Tuple of (inserted_count, skipped_count, status_message)
     """
-    ticker = ticker.upper().strip()
+    ticker = _normalize_ticker(ticker)
     logger.info(f"Fetching yfinance prices for {ticker} from {start_date} to {end_date}")
 
     # Default end_date to today
@@ -54,95 +153,222 @@ def fetch_stock_prices(
         start_dt = end_dt - timedelta(days=365 * years_back)
         start_date = start_dt.strftime("%Y-%m-%d")
 
+    # Empty range - nothing to download, don't spend a Yahoo round-trip on it
+    if start_date > end_date:
+        logger.info(f"Skipping yfinance fetch for {ticker}: start {start_date} is after end {end_date}")
+        return 0, 0, f"⚠️ No data found for {ticker} between {start_date} and {end_date}"
+
     try:
         # Fetch data from yfinance
         logger.debug(f"Calling yfinance API for {ticker}")
-        stock = yf.Ticker(ticker)
+        stock = _ticker(ticker)
         data = stock.history(start=start_date, end=end_date, auto_adjust=True)
 
-        if data.empty:
-            logger.warning(f"No data found for {ticker} between {start_date} and {end_date}")
-            return 0, 0, f"⚠️ No data found for {ticker} between {start_date} and {end_date}"
+        return _store_history(ticker, data, start_date, end_date)
 
-        all_prices = []
-        for date_idx, row in data.iterrows():
-            date_str = date_idx.strftime("%Y-%m-%d")
-            # Use Close price
-            price = float(row["Close"])
-            all_prices.append((date_str, ticker, price))
+    except Exception as e:
+        logger.error(f"Error fetching yfinance prices for {ticker}: {e}", exc_info=True)
+        return 0, 0, f"❌ Error fetching {ticker}: {e}"
 
-        if not all_prices:
-            logger.warning(f"No prices extracted for {ticker} between {start_date} and {end_date}")
-            return 0, 0, f"⚠️ No data found for {ticker} between {start_date} and {end_date}"
 
-        logger.info(f"Collected {len(all_prices)} prices for {ticker}, bulk inserting...")
-        # Bulk insert all collected prices with USD currency
-        inserted, skipped = bulk_add_fund_prices(all_prices, source="yfinance", currency=CURRENCY_USD)
-        logger.info(f"yfinance fetch completed for {ticker}: {inserted} inserted, {skipped} skipped")
+# Yahoo accepts up to 20 symbols per download request
+_BULK_CHUNK_SIZE = 20
 
-        return inserted, skipped, f"✅ {ticker}: {inserted} new prices added, {skipped} already existed"
 
-    except Exception as e:
-        logger.error(f"Error fetching yfinance prices for {ticker}: {e}", exc_info=True)
-        return 0, 0, f"❌ Error fetching {ticker}: {e}"
+def _bulk_frame(data: pd.DataFrame | None, ticker: str) -> pd.DataFrame | None:
+    """Extract one ticker's rows from a group_by='ticker' download, or None if it is missing."""
+    if data is None or data.empty or not isinstance(data.columns, pd.MultiIndex):
+        return None
+    if ticker not in data.columns.get_level_values(0):
+        return None
+    frame = data[ticker].dropna(subset=["Close"])
+    return None if frame.empty else frame
 
 
-def update_stock_prices(ticker: str) -> tuple[int, int, str]:
+def fetch_stock_prices_bulk(tickers: list[str], start_date: str, end_date: str) -> dict[str, tuple[int, int, str]]:
     """
-    Update prices for a stock - only fetches missing recent data.
-    Checks the latest stored date and fetches from there to today.
+    Fetch prices for several stocks over the same date range and store them in the database.
+    Tickers are downloaded 20 per request with yf.download; any ticker missing from the
+    bulk response falls back to fetch_stock_prices.
 
     Args:
-        ticker: Stock ticker symbol
+        tickers: Stock ticker symbols
+        start_date: Start date (YYYY-MM-DD)
+        end_date: End date (YYYY-MM-DD)
 
     Returns:
-        Tuple of (inserted_count, skipped_count, status_message)
+        Dict mapping normalized ticker -> (inserted_count, skipped_count, status_message)
     """
-    ticker = ticker.upper().strip()
-    today = datetime.now().strftime("%Y-%m-%d")
-    logger.info(f"Updating yfinance prices for {ticker}")
+    symbols = list(dict.fromkeys(_normalize_ticker(t) for t in tickers))
+    results: dict[str, tuple[int, int, str]] = {}
+
+    if start_date > end_date:
+        for symbol in symbols:
+            results[symbol] = (0, 0, f"⚠️ No data found for {symbol} between {start_date} and {end_date}")
+        return results
+
+    for i in range(0, len(symbols), _BULK_CHUNK_SIZE):
+        chunk = symbols[i : i + _BULK_CHUNK_SIZE]
+        logger.info(f"Fetching yfinance prices for {len(chunk)} tickers from {start_date} to {end_date}")
+        try:
+            data = yf.download(
+                " ".join(chunk),
+                start=start_date,
+                end=end_date,
+                group_by="ticker",
+                threads=True,
+                auto_adjust=True,
+                progress=False,
+                session=_get_session(),
+            )
+        except Exception as e:
+            logger.warning(f"Bulk yfinance download failed for {chunk}: {e}")
+            data = None
+
+        # Rows of every ticker in the chunk go into one transaction
+        chunk_rows: list[tuple[str, str, float]] = []
+        pending: dict[str, int] = {}
+
+        for symbol in chunk:
+            frame = _bulk_frame(data, symbol)
+            if frame is None:
+                # Incomplete bulk response - fall back to the per-ticker path
+                results[symbol] = fetch_stock_prices(symbol, start_date=start_date, end_date=end_date)
+                continue
+            try:
+                rows, already_stored = _new_rows(symbol, frame)
+            except Exception as e:
+                logger.error(f"Error storing yfinance prices for {symbol}: {e}", exc_info=True)
+                results[symbol] = (0, 0, f"❌ Error fetching {symbol}: {e}")
+                continue
+            chunk_rows.extend(rows)
+            pending[symbol] = already_stored
+
+        counts: dict[str, tuple[int, int]] = {}
+        if chunk_rows:
+            logger.info(f"Bulk inserting {len(chunk_rows)} new prices for {len(pending)} tickers...")
+            try:
+                counts = bulk_add_fund_prices_by_ticker(chunk_rows, source="yfinance", currency=CURRENCY_USD)
+            except Exception as e:
+                logger.error(f"Error storing yfinance prices for {', '.join(pending)}: {e}", exc_info=True)
+                for symbol in pending:
+                    results[symbol] = (0, 0, f"❌ Error fetching {symbol}: {e}")
+                continue
+            if any(inserted for inserted, _ in counts.values()):
+                # New prices may change the latest price - drop memoized lookups
+                _get_current_stock_price.cache_clear()
+
+        for symbol, already_stored in pending.items():
+            inserted, skipped = counts.get(symbol, (0, 0))
+            skipped += already_stored
+            results[symbol] = (inserted, skipped, f"✅ {symbol}: {inserted} new prices added, {skipped} already existed")
+
+    return results
+
+
+def _update_start_date(ticker: str, today: str) -> tuple[str | None, str | None]:
+    """
+    Work out where an incremental update for ticker has to start.
 
+    Returns:
+        Tuple of (start_date, latest_stored_date). start_date is None when the ticker
+        is already up to date; latest_stored_date is None when nothing is stored yet.
+    """
     latest = get_latest_fund_price(ticker)
 
     if latest is None:
         logger.info(f"No existing data for {ticker}, fetching full history")
         # No data exists, fetch full history
-        return fetch_stock_prices(ticker, end_date=today)
+        start_dt = datetime.strptime(today, "%Y-%m-%d") - timedelta(days=365 * 5)
+        return start_dt.strftime("%Y-%m-%d"), None
 
     latest_date, _, _ = latest
-    latest_dt = datetime.strptime(latest_date, "%Y-%m-%d")
 
-    # If latest date is today, we're definitely up to date
-    if latest_date == today:
-        logger.info(f"{ticker} is up to date (latest: {latest_date} is today)")
-        return 0, 0, f"✅ {ticker} is up to date (latest: {latest_date})"
+    # If we already have the previous business day's close, skip the network call entirely
+    last_business_day = (pd.Timestamp(today) - BDay(1)).strftime("%Y-%m-%d")
+    if latest_date >= last_business_day:
+        logger.info(f"{ticker} is up to date (latest: {latest_date}, last business day: {last_business_day})")
+        return None, latest_date
 
     # Always try to fetch from day after latest to today
     # This ensures we get data even on weekdays when markets are open
-    start_dt = latest_dt + timedelta(days=1)
+    start_dt = datetime.strptime(latest_date, "%Y-%m-%d") + timedelta(days=1)
     start_date = start_dt.strftime("%Y-%m-%d")
 
     # If start_date is in the future, we're already up to date
     if start_date > today:
         logger.info(f"{ticker} is up to date (start_date {start_date} is in the future)")
-        return 0, 0, f"✅ {ticker} is up to date (latest: {latest_date})"
+        return None, latest_date
 
-    logger.info(f"Fetching updates for {ticker} from {start_date} to {today}")
+    return start_date, latest_date
 
-    inserted, skipped, msg = fetch_stock_prices(ticker, start_date=start_date, end_date=today)
 
-    # If we inserted new data, return success
-    if inserted > 0:
-        return inserted, skipped, msg
+def _update_result(ticker: str, latest_date: str | None, result: tuple[int, int, str]) -> tuple[int, int, str]:
+    """Turn an empty incremental fetch (markets closed) into an up-to-date message."""
+    inserted, skipped, msg = result
 
     # If no data was found (markets closed), return up to date message
-    if inserted == 0 and skipped == 0 and "No data found" in msg:
+    if latest_date is not None and inserted == 0 and skipped == 0 and "No data found" in msg:
         logger.info(f"{ticker} appears up to date (no new data found, markets may be closed)")
         return 0, 0, f"✅ {ticker} is up to date (latest: {latest_date})"
 
-    # If skipped > 0, data already existed (shouldn't happen if we're fetching from day after latest)
-    # But return the message anyway
-    return inserted, skipped, msg
+    return result
+
+
+def update_stock_prices(ticker: str) -> tuple[int, int, str]:
+    """
+    Update prices for a stock - only fetches missing recent data.
+    Checks the latest stored date and fetches from there to today.
+
+    Args:
+        ticker: Stock ticker symbol
+
+    Returns:
+        Tuple of (inserted_count, skipped_count, status_message)
+    """
+    ticker = _normalize_ticker(ticker)
+    today = datetime.now().strftime("%Y-%m-%d")
+    logger.info(f"Updating yfinance prices for {ticker}")
+
+    start_date, latest_date = _update_start_date(ticker, today)
+    if start_date is None:
+        return 0, 0, f"✅ {ticker} is up to date (latest: {latest_date})"
+
+    logger.info(f"Fetching updates for {ticker} from {start_date} to {today}")
+    result = fetch_stock_prices(ticker, start_date=start_date, end_date=today)
+    return _update_result(ticker, latest_date, result)
+
+
+def update_stock_prices_bulk(tickers: list[str]) -> dict[str, tuple[int, int, str]]:
+    """
+    Update prices for several stocks - only fetches missing recent data.
+    Tickers that need the same start date share bulk download requests.
+
+    Args:
+        tickers: Stock ticker symbols
+
+    Returns:
+        Dict mapping normalized ticker -> (inserted_count, skipped_count, status_message)
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    results: dict[str, tuple[int, int, str]] = {}
+    latest_dates: dict[str, str | None] = {}
+    by_start: dict[str, list[str]] = {}
+
+    for ticker in dict.fromkeys(_normalize_ticker(t) for t in tickers):
+        start_date, latest_date = _update_start_date(ticker, today)
+        if start_date is None:
+            results[ticker] = (0, 0, f"✅ {ticker} is up to date (latest: {latest_date})")
+            continue
+        latest_dates[ticker] = latest_date
+        by_start.setdefault(start_date, []).append(ticker)
+
+    for start_date, bucket in by_start.items():
+        logger.info(f"Fetching updates for {bucket} from {start_date} to {today}")
+        for ticker, result in fetch_stock_prices_bulk(bucket, start_date, today).items():
+            results[ticker] = _update_result(ticker, latest_dates[ticker], result)
+
+    return results
 
 
 def fetch_prices_for_new_stock(ticker: str, transaction_date: str) -> tuple[int, int, str]:
@@ -157,7 +383,7 @@ def fetch_prices_for_new_stock(ticker: str, transaction_date: str) -> tuple[int,
     Returns:
         Tuple of (inserted_count, skipped_count, status_message)
     """
-    ticker = ticker.upper().strip()
+    ticker = _normalize_ticker(ticker)
     today = datetime.now().strftime("%Y-%m-%d")
 
     # Check if we already have data for this ticker
@@ -186,6 +412,7 @@ def get_current_stock_price(ticker: str) -> float | None:
     """
     Get the most recent price for a stock.
     First tries the database, then fetches from yfinance if not recent enough.
+    Results are memoized per ticker for 60 seconds.
 
     Args:
         ticker: Stock ticker symbol
@@ -193,8 +420,12 @@ def get_current_stock_price(ticker: str) -> float | None:
     Returns:
         Current price or None if not available
     """
-    ticker = ticker.upper().strip()
+    return _get_current_stock_price(_normalize_ticker(ticker))
+
 
+@ttl_lru_cache(maxsize=512, ttl=60)
+def _get_current_stock_price(ticker: str) -> float | None:
+    """Uncached lookup behind get_current_stock_price (ticker already normalized)."""
     latest = get_latest_fund_price(ticker)
 
     if latest:
@@ -212,6 +443,9 @@ def get_current_stock_price(ticker: str) -> float | None:
     return latest[1] if latest else None
 
 
+get_current_stock_price.cache_clear = _get_current_stock_price.cache_clear
+
+
 def is_valid_stock(ticker: str) -> bool:
     """
     Check if a ticker is a valid stock by attempting to fetch recent data.
@@ -223,14 +457,60 @@ def is_valid_stock(ticker: str) -> bool:
         True if valid stock, False otherwise
     """
     try:
-        stock = yf.Ticker(ticker.upper().strip())
-        info = stock.info
-        # Check if we have valid price data
-        return info.get("regularMarketPrice") is not None or info.get("previousClose") is not None
+        info = _fetch_info(ticker)
+        return _has_price(info)
     except Exception:
         return False
 
 
+def is_valid_stocks(tickers: list[str]) -> dict[str, bool]:
+    """
+    Validate several tickers at once.
+    Cached info is used where available; the rest are looked up through a single
+    yf.Tickers object sharing one session.
+
+    Args:
+        tickers: Stock tickers to validate
+
+    Returns:
+        Dict mapping normalized ticker -> True if valid stock, False otherwise
+    """
+    symbols = list(dict.fromkeys(_normalize_ticker(t) for t in tickers if t and t.strip()))
+    results: dict[str, bool] = {}
+    missing = []
+
+    for symbol in symbols:
+        info = _info_cache.get(_info_key(symbol))
+        if info is not None:
+            results[symbol] = _has_price(info)
+        else:
+            missing.append(symbol)
+
+    if missing:
+        try:
+            batch = yf.Tickers(" ".join(missing), session=_get_session())
+        except Exception as e:
+            logger.warning(f"Could not create yfinance batch for {missing}: {e}")
+            batch = None
+
+        for symbol in missing:
+            try:
+                info = dict(batch.tickers[symbol].info)
+            except Exception:
+                results[symbol] = False
+                continue
+            if info:
+                _info_cache.set(_info_key(symbol), info)
+            results[symbol] = _has_price(info)
+
+    return results
+
+
+def _has_price(info: dict) -> bool:
+    """Check if a yfinance info dict has valid price data."""
+    return info.get("regularMarketPrice") is not None or info.get("previousClose") is not None
+
+
 def get_stock_info(ticker: str) -> dict | None:
     """
     Get basic info about a stock.
@@ -242,9 +522,8 @@ def get_stock_info(ticker: str) -> dict | None:
         Dict with stock info or None if not found
     """
     try:
-        ticker = ticker.upper().strip()
-        stock = yf.Ticker(ticker)
-        info = stock.info
+        ticker = _normalize_ticker(ticker)
+        info = _fetch_info(ticker)
         return {
             "ticker": ticker,
             "name": info.get("shortName") or info.get("longName", ticker),
@@ -4,6 +4,7 @@ Core modules for database and analysis operations.
 
 from core.database import (
     get_connection,
+    get_data_version,
     init_db,
     # Transaction functions
     add_transaction,
@@ -15,13 +16,16 @@ from core.database import (
     add_cpi_usd_rate,
     get_cpi_usd_rates,
     get_cpi_usd_rate_for_date,
+    get_cpi_usd_rates_for_dates,
     delete_cpi_usd_rate,
     bulk_import_cpi_usd_rates,
+    bulk_upsert_cpi_usd_rates,
     # Official CPI functions
     add_cpi_official,
     get_cpi_official_data,
     delete_cpi_official,
     bulk_import_cpi_official,
+    bulk_upsert_cpi_official,
     calculate_cumulative_cpi,
     calculate_cumulative_cpi_daily,
     get_cpi_mom_for_month,
@@ -29,16 +33,20 @@ from core.database import (
     # Fund price functions
     add_fund_price,
     bulk_add_fund_prices,
+    bulk_add_fund_prices_by_ticker,
     get_fund_prices,
+    get_fund_prices_wide,
     get_latest_fund_price,
     get_fund_price_for_date,
     get_oldest_fund_price_date,
     get_fund_price_date_range,
+    get_fund_price_dates,
     get_all_fund_latest_prices,
 )
 
 from core.analysis import (
     fetch_usd_rate_from_yfinance,
+    fetch_usd_rates_for_dates,
     get_usd_rate,
     calculate_real_return,
     calculate_portfolio_summary,
@@ -51,6 +59,7 @@ from core.analysis import (
 __all__ = [
     # Database
     "get_connection",
+    "get_data_version",
     "init_db",
     "add_transaction",
     "get_portfolio",
@@ -60,26 +69,33 @@ __all__ = [
     "add_cpi_usd_rate",
     "get_cpi_usd_rates",
     "get_cpi_usd_rate_for_date",
+    "get_cpi_usd_rates_for_dates",
     "delete_cpi_usd_rate",
     "bulk_import_cpi_usd_rates",
+    "bulk_upsert_cpi_usd_rates",
     "add_cpi_official",
     "get_cpi_official_data",
     "delete_cpi_official",
     "bulk_import_cpi_official",
+    "bulk_upsert_cpi_official",
     "calculate_cumulative_cpi",
     "calculate_cumulative_cpi_daily",
     "get_cpi_mom_for_month",
     "get_latest_cpi_mom",
     "add_fund_price",
     "bulk_add_fund_prices",
+    "bulk_add_fund_prices_by_ticker",
     "get_fund_prices",
+    "get_fund_prices_wide",
     "get_latest_fund_price",
     "get_fund_price_for_date",
     "get_oldest_fund_price_date",
     "get_fund_price_date_range",
+    "get_fund_price_dates",
     "get_all_fund_latest_prices",
     # Analysis
     "fetch_usd_rate_from_yfinance",
+    "fetch_usd_rates_for_dates",
     "get_usd_rate",
     "calculate_real_return",
     "calculate_portfolio_summary",
@@ -14,7 +14,14 @@ from datetime import datetime, timedelta
 import pandas as pd
 import yfinance as yf
 
-from core.database import get_cpi_usd_rate_for_date, add_cpi_usd_rate, calculate_cumulative_cpi_daily, get_cpi_usd_rates
+from core.database import (
+    get_cpi_usd_rate_for_date,
+    add_cpi_usd_rate,
+    bulk_upsert_cpi_usd_rates,
+    calculate_cumulative_cpi_daily,
+    get_cpi_usd_rates,
+    get_connection,
+)
 
 
 def fetch_usd_rate_from_yfinance(date_str: str) -> float | None:
@@ -40,6 +47,54 @@ def fetch_usd_rate_from_yfinance(date_str: str) -> float | None:
         return None
 
 
+def fetch_usd_rates_for_dates(dates: list[str]) -> dict[str, float]:
+    """
+    Fetch USD/TRY rates for many dates with one ranged yfinance download and store them.
+
+    Each date gets the first close within 5 days from it, like fetch_usd_rate_from_yfinance,
+    but N dates cost a single request instead of N.
+
+    Args:
+        dates: Dates in YYYY-MM-DD format
+
+    Returns:
+        Dictionary mapping date -> rate for the dates that could be fetched
+    """
+    if not dates:
+        return {}
+
+    ordered = sorted(set(dates))
+    window = timedelta(days=5)  # Window to handle weekends/holidays
+    end_date = datetime.strptime(ordered[-1], "%Y-%m-%d") + window
+
+    try:
+        data = yf.download("TRY=X", start=ordered[0], end=end_date.strftime("%Y-%m-%d"), progress=False)
+    except Exception:
+        return {}
+    if data is None or data.empty or "Close" not in data.columns.get_level_values(0):
+        return {}
+
+    close = data["Close"]
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
+    close = close.dropna()
+    if close.index.tz is not None:
+        close.index = close.index.tz_localize(None)
+
+    # First trading day on or after each date, if it falls inside the window
+    targets = pd.to_datetime(ordered)
+    positions = close.index.searchsorted(targets, side="left")
+    values = close.to_numpy(dtype="float64")
+    rates = {}
+    for date_str, target, pos in zip(ordered, targets, positions):
+        if pos < len(close) and close.index[pos] < target + window:
+            rates[date_str] = float(values[pos])
+
+    if rates:
+        bulk_upsert_cpi_usd_rates(list(rates.items()), source="yfinance_auto", notes="Auto-fetched")
+    return rates
+
+
 def get_usd_rate(date_str: str, auto_fetch: bool = False) -> float | None:
     """
     Get USD/TRY rate for a date.
@@ -270,14 +325,10 @@ def fetch_usd_rates_for_date_range(start_date: str, end_date: str) -> tuple[int,
         if close_col is None:
             return 0, "❌ Could not parse USD/TRY data from yfinance"
 
-        # Insert each rate into the database
-        imported = 0
-        for date_idx, rate in close_col.items():
-            if pd.notna(rate):
-                date_str = date_idx.strftime("%Y-%m-%d")
-                result = add_cpi_usd_rate(date_str, float(rate), source="yfinance_batch", notes="Batch fetched")
-                if result.startswith("✅"):
-                    imported += 1
+        # Store all rates with one executemany instead of a transaction per date
+        close_col = close_col.dropna()
+        rows = list(zip(close_col.index.strftime("%Y-%m-%d"), close_col.to_numpy(dtype="float64").tolist()))
+        imported = bulk_upsert_cpi_usd_rates(rows, source="yfinance_batch", notes="Batch fetched") if rows else 0
 
         if imported > 0:
             return imported, f"✅ Fetched {imported} USD/TRY rates ({start_date} to {end_date})"
@@ -299,8 +350,6 @@ def fetch_all_usd_rates() -> tuple[int, int, str]:
     Returns:
         Tuple of (new_rates_count, total_rates_count, status_message)
     """
-    from core.database import get_connection
-
     # Find the earliest date we need rates for
     with get_connection() as conn:
         c = conn.cursor()
@@ -398,17 +447,16 @@ def get_usd_rates_as_dataframe(start_date: str | None = None, end_date: str | No
     Returns:
         DataFrame with date and usd_try_rate columns, sorted by date ascending
     """
-    df = get_cpi_usd_rates()
-    if df.empty:
-        return pd.DataFrame(columns=["date", "usd_try_rate"])
-
-    # Filter by date range if provided
+    # Range filter and ordering run in SQLite instead of on the whole table in pandas
+    query = "SELECT date, usd_try_rate FROM cpi_usd_rates WHERE 1=1"
+    params: list = []
     if start_date:
-        df = df[df["date"] >= start_date]
+        query += " AND date >= ?"
+        params.append(start_date)
     if end_date:
-        df = df[df["date"] <= end_date]
+        query += " AND date <= ?"
+        params.append(end_date)
+    query += " ORDER BY date ASC"
 
-    # Sort by date ascending for charting
-    df = df.sort_values("date", ascending=True)
-
-    return df[["date", "usd_try_rate"]]
+    with get_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
@@ -6,6 +6,8 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_path: str = "data/portfolio.db"
+    # Concurrent per-ticker downloads in the refresh checks (network-bound)
+    refresh_max_workers: int = 8
     # tefas_chunk_days: int = 60
     # tefas_years_back: int = 5
     # yfinance_tickers: tuple[str, ...] = ("USDTRY=X", "TRY=X")
@@ -8,12 +8,16 @@ Supports multiple asset types:
 - CASH: Cash holdings (TRY or USD)
 """
 
+import csv
+import re
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Generator
 
+import numpy as np
 import pandas as pd
 
 from core.config import get_settings
@@ -51,9 +55,16 @@ def get_connection() -> Generator[sqlite3.Connection, None, None]:
 
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
+    # Per-connection tuning; with WAL (set in init_db) NORMAL sync only fsyncs at checkpoints
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
     try:
         yield conn
+        changed = conn.total_changes > 0
         conn.commit()
+        if changed:
+            _bump_data_version()
     except Exception as e:
         logger.error(f"Database transaction failed, rolling back: {e}", exc_info=True)
         conn.rollback()
@@ -62,11 +73,36 @@ def get_connection() -> Generator[sqlite3.Connection, None, None]:
         conn.close()
 
 
+# Incremented after every commit that changed rows (transactions, USD/TRY rates, CPI, fund prices).
+# Every write goes through get_connection, so caches can compare this instead of re-reading data.
+_data_version = 0
+_data_version_lock = threading.Lock()
+
+
+def _bump_data_version() -> None:
+    global _data_version
+    with _data_version_lock:
+        _data_version += 1
+
+
+def get_data_version() -> int:
+    """
+    Version of the stored data in this process.
+
+    Returns:
+        Counter that changes whenever a write to the database is committed
+    """
+    return _data_version
+
+
 def init_db() -> None:
     """Initialize the database with transactions and CPI/USD rates tables."""
     with get_connection() as conn:
         c = conn.cursor()
 
+        # WAL is persistent in the database file: readers don't block the writer and commits are cheaper
+        c.execute("PRAGMA journal_mode=WAL")
+
         # Transactions table for portfolio tracking
         c.execute("""
             CREATE TABLE IF NOT EXISTS transactions (
@@ -385,8 +421,15 @@ def add_cpi_usd_rate(date: str, rate: float, source: str = "manual", notes: str
         return f"❌ Error: {e}"
 
 
-def get_cpi_usd_rates() -> pd.DataFrame:
-    """Retrieve all CPI/USD rates as a Pandas DataFrame."""
+def get_cpi_usd_rates(conn: sqlite3.Connection | None = None) -> pd.DataFrame:
+    """
+    Retrieve all CPI/USD rates as a Pandas DataFrame.
+
+    Args:
+        conn: Optional open connection to reuse instead of opening a new one
+    """
+    if conn is not None:
+        return pd.read_sql_query("SELECT * FROM cpi_usd_rates ORDER BY date DESC", conn)
     with get_connection() as conn:
         df = pd.read_sql_query("SELECT * FROM cpi_usd_rates ORDER BY date DESC", conn)
     return df
@@ -425,6 +468,25 @@ def get_cpi_usd_rate_for_date(date: str, exact_match: bool = False) -> float | N
     return result[0] if result else None
 
 
+def get_cpi_usd_rates_for_dates(dates: list[str]) -> dict[str, float]:
+    """
+    Get the stored USD/TRY rates for several exact dates in one query.
+
+    Args:
+        dates: Dates in YYYY-MM-DD format
+
+    Returns:
+        Dictionary mapping date -> rate for the dates that have a stored rate
+    """
+    if not dates:
+        return {}
+    placeholders = ",".join("?" * len(dates))
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute(f"SELECT date, usd_try_rate FROM cpi_usd_rates WHERE date IN ({placeholders})", list(dates))
+        return dict(c.fetchall())
+
+
 def delete_cpi_usd_rate(rate_id: int) -> str:
     """Delete a CPI/USD rate by ID."""
     try:
@@ -438,31 +500,58 @@ def delete_cpi_usd_rate(rate_id: int) -> str:
         return f"❌ Error: {e}"
 
 
+def bulk_upsert_cpi_usd_rates(rows: list[tuple[str, float]], source: str = "bulk_import", chunksize: int = 1000, notes: str = "") -> int:
+    """
+    Insert or replace many USD/TRY rates in a single transaction.
+
+    Args:
+        rows: List of (date, rate) tuples with validated YYYY-MM-DD dates
+        source: Data source stored with every row
+        chunksize: Number of rows per executemany batch
+        notes: Notes stored with every row
+
+    Returns:
+        Number of rows written
+    """
+    params = [(date, float(rate), source, notes) for date, rate in rows]
+    with get_connection() as conn:
+        c = conn.cursor()
+        for i in range(0, len(params), chunksize):
+            c.executemany(
+                """INSERT OR REPLACE INTO cpi_usd_rates (date, usd_try_rate, source, notes) 
+                   VALUES (?, ?, ?, ?)""",
+                params[i : i + chunksize],
+            )
+    return len(params)
+
+
 def bulk_import_cpi_usd_rates(csv_text: str) -> str:
     """
     Import multiple CPI/USD rates from CSV format.
     Expected format: date,rate (one per line)
     """
     try:
-        lines = [line.strip() for line in csv_text.strip().split("\n") if line.strip()]
-        imported = 0
+        rows = []
         errors = []
 
-        for line in lines:
-            if "," not in line:
-                continue
-            parts = line.split(",")
+        # csv.reader is the C-implemented parser; lines without a comma yield < 2 fields and are skipped
+        for parts in csv.reader(csv_text.strip().splitlines(), skipinitialspace=True):
             if len(parts) >= 2:
                 date_str = parts[0].strip()
                 rate_str = parts[1].strip()
                 try:
-                    result = add_cpi_usd_rate(date_str, float(rate_str), source="bulk_import")
-                    if result.startswith("✅"):
-                        imported += 1
-                    else:
-                        errors.append(f"{date_str}: {result}")
+                    rate = float(rate_str)
                 except ValueError:
                     errors.append(f"{date_str}: Invalid rate value")
+                    continue
+                try:
+                    valid_date = datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
+                except ValueError:
+                    errors.append(f"{date_str}: ❌ Error: Date must be in YYYY-MM-DD format")
+                    continue
+                rows.append((valid_date, rate))
+
+        imported = bulk_upsert_cpi_usd_rates(rows, source="bulk_import") if rows else 0
 
         msg = f"✅ Imported {imported} rate(s)"
         if errors:
@@ -523,6 +612,33 @@ def delete_cpi_official(cpi_id: int) -> str:
         return f"❌ Error: {e}"
 
 
+def bulk_upsert_cpi_official(rows: list[tuple[str, float, float | None]], chunksize: int = 1000) -> int:
+    """
+    Insert or replace many official CPI entries in a single transaction.
+
+    Args:
+        rows: List of (year_month, cpi_yoy, cpi_mom) tuples with validated YYYY-MM keys
+        chunksize: Number of rows per executemany batch
+
+    Returns:
+        Number of rows written
+    """
+    params = [(ym, float(yoy), float(mom) if mom is not None else None, "") for ym, yoy, mom in rows]
+    with get_connection() as conn:
+        c = conn.cursor()
+        for i in range(0, len(params), chunksize):
+            c.executemany(
+                """INSERT OR REPLACE INTO cpi_official (year_month, cpi_yoy, cpi_mom, source, notes) 
+                   VALUES (?, ?, ?, 'TCMB', ?)""",
+                params[i : i + chunksize],
+            )
+    return len(params)
+
+
+# YYYY-MM (groups 1-2) or MM-YYYY (groups 3-4), compiled once for bulk imports
+_YEAR_MONTH_RE = re.compile(r"(?:(\d{4})-(\d{2})|(\d{2})-(\d{4}))\Z")
+
+
 def bulk_import_cpi_official(csv_text: str) -> str:
     """
     Import multiple CPI entries from CSV format.
@@ -530,35 +646,31 @@ def bulk_import_cpi_official(csv_text: str) -> str:
     Supports both MM-YYYY and YYYY-MM formats.
     """
     try:
-        lines = [line.strip() for line in csv_text.strip().split("\n") if line.strip()]
-        imported = 0
+        rows = []
         errors = []
 
-        for line in lines:
-            if "," not in line:
-                continue
-            parts = line.split(",")
+        for parts in csv.reader(csv_text.strip().splitlines(), skipinitialspace=True):
             if len(parts) >= 2:
                 ym_str = parts[0].strip()
                 yoy_str = parts[1].strip()
                 mom_str = parts[2].strip() if len(parts) >= 3 else None
 
-                # Convert MM-YYYY to YYYY-MM if needed
-                if "-" in ym_str:
-                    ym_parts = ym_str.split("-")
-                    if len(ym_parts[0]) == 2 and len(ym_parts[1]) == 4:
-                        ym_str = f"{ym_parts[1]}-{ym_parts[0]}"
+                # Accept YYYY-MM or MM-YYYY (converted to YYYY-MM)
+                match = _YEAR_MONTH_RE.match(ym_str)
+                if match is None:
+                    errors.append(f"{ym_str}: ❌ Error: Format must be YYYY-MM (e.g., 2024-12)")
+                    continue
+                year, month, mm, yyyy = match.groups()
+                ym_str = f"{year}-{month}" if year else f"{yyyy}-{mm}"
 
                 try:
                     mom_val = float(mom_str) if mom_str else None
-                    result = add_cpi_official(ym_str, float(yoy_str), mom_val)
-                    if result.startswith("✅"):
-                        imported += 1
-                    else:
-                        errors.append(f"{ym_str}: {result}")
+                    rows.append((ym_str, float(yoy_str), mom_val))
                 except ValueError:
                     errors.append(f"{ym_str}: Invalid value")
 
+        imported = bulk_upsert_cpi_official(rows) if rows else 0
+
         msg = f"✅ Imported {imported} CPI record(s)"
         if errors:
             msg += f"\n⚠️ Errors: {len(errors)}\n" + "\n".join(errors[:5])
@@ -777,26 +889,74 @@ def bulk_add_fund_prices(prices: list[tuple[str, str, float]], source: str = "te
     Returns:
         Tuple of (inserted_count, skipped_count)
     """
+    rows = []
+    invalid = 0
+    for date, ticker, price in prices:
+        try:
+            rows.append((date, ticker.upper().strip(), float(price), currency, source))
+        except (AttributeError, TypeError, ValueError):
+            invalid += 1
+
+    if not rows:
+        return 0, invalid
+
+    # One executemany in a single transaction instead of a statement per row
     with get_connection() as conn:
         c = conn.cursor()
-        inserted = 0
-        skipped = 0
+        c.executemany(
+            """INSERT OR IGNORE INTO fund_prices (date, ticker, price, currency, source) 
+               VALUES (?, ?, ?, ?, ?)""",
+            rows,
+        )
+        inserted = max(c.rowcount, 0)
 
-        for date, ticker, price in prices:
-            try:
-                c.execute(
+    return inserted, len(rows) - inserted + invalid
+
+
+def bulk_add_fund_prices_by_ticker(
+    prices: list[tuple[str, str, float]], source: str = "tefas", currency: str = CURRENCY_TRY
+) -> dict[str, tuple[int, int]]:
+    """
+    Bulk insert fund prices for several tickers in one transaction, counting per ticker.
+    Skips existing dates (no updates).
+
+    Args:
+        prices: List of (date, ticker, price) tuples
+        source: Data source
+        currency: Currency of the prices (TRY or USD)
+
+    Returns:
+        Dict mapping normalized ticker -> (inserted_count, skipped_count)
+    """
+    if not prices:
+        return {}
+
+    grouped: dict[str, list[tuple]] = {}
+    invalid: dict[str, int] = {}
+    for date, ticker, price in prices:
+        symbol = str(ticker).upper().strip()
+        grouped.setdefault(symbol, [])
+        try:
+            grouped[symbol].append((date, symbol, float(price), currency, source))
+        except (TypeError, ValueError):
+            invalid[symbol] = invalid.get(symbol, 0) + 1
+
+    counts = {}
+    # Still a single transaction - one executemany per ticker only so rowcount can be attributed
+    with get_connection() as conn:
+        c = conn.cursor()
+        for symbol, rows in grouped.items():
+            inserted = 0
+            if rows:
+                c.executemany(
                     """INSERT OR IGNORE INTO fund_prices (date, ticker, price, currency, source) 
                        VALUES (?, ?, ?, ?, ?)""",
-                    (date, ticker.upper().strip(), float(price), currency, source),
+                    rows,
                 )
-                if c.rowcount > 0:
-                    inserted += 1
-                else:
-                    skipped += 1
-            except Exception:
-                skipped += 1
+                inserted = max(c.rowcount, 0)
+            counts[symbol] = (inserted, len(rows) - inserted + invalid.get(symbol, 0))
 
-    return inserted, skipped
+    return counts
 
 
 def get_fund_prices(ticker: str, start_date: str | None = None, end_date: str | None = None) -> pd.DataFrame:
@@ -827,6 +987,44 @@ def get_fund_prices(ticker: str, start_date: str | None = None, end_date: str |
     return df
 
 
+def get_fund_prices_wide(tickers: list[str], start_date: str | None = None) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    """
+    Get prices for several funds as a wide date x ticker matrix in one query.
+
+    Args:
+        tickers: Fund ticker symbols
+        start_date: Optional start date (YYYY-MM-DD)
+
+    Returns:
+        Tuple of (dates, matrix, columns):
+        dates is a sorted datetime64 array, matrix is a float64 array of shape
+        (len(dates), len(columns)) with NaN where a fund has no price that day,
+        and columns lists the tickers that have data, in the requested order.
+    """
+    symbols = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    if not symbols:
+        return np.array([], dtype="datetime64[ns]"), np.empty((0, 0)), []
+
+    with get_connection() as conn:
+        query = f"SELECT date, ticker, price FROM fund_prices WHERE ticker IN ({','.join('?' * len(symbols))})"
+        params: list = list(symbols)
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+
+        df = pd.read_sql_query(query, conn, params=params)
+
+    if df.empty:
+        return np.array([], dtype="datetime64[ns]"), np.empty((0, 0)), []
+
+    wide = df.pivot(index="date", columns="ticker", values="price").sort_index()
+    columns = [t for t in symbols if t in wide.columns]
+    matrix = wide[columns].to_numpy(dtype="float64")
+    dates = pd.to_datetime(wide.index).to_numpy()
+    return dates, matrix, columns
+
+
 def get_latest_fund_price(ticker: str) -> tuple[str, float, str] | None:
     """
     Get the most recent price for a fund.
@@ -913,6 +1111,27 @@ def get_fund_price_date_range(ticker: str) -> tuple[str, str] | None:
     return None
 
 
+def get_fund_price_dates(ticker: str, start_date: str, end_date: str) -> list[str]:
+    """
+    Get the dates with a stored price for a fund within a date range.
+
+    Args:
+        ticker: Fund ticker symbol
+        start_date: Start date (YYYY-MM-DD), inclusive
+        end_date: End date (YYYY-MM-DD), inclusive
+
+    Returns:
+        List of YYYY-MM-DD dates
+    """
+    with get_connection() as conn:
+        c = conn.cursor()
+        c.execute(
+            "SELECT date FROM fund_prices WHERE ticker = ? AND date >= ? AND date <= ?",
+            (ticker.upper().strip(), start_date, end_date),
+        )
+        return [row[0] for row in c.fetchall()]
+
+
 def get_all_fund_latest_prices() -> dict[str, tuple[str, float, str]]:
     """
     Get the latest price for all funds in the database.
@@ -922,9 +1141,11 @@ def get_all_fund_latest_prices() -> dict[str, tuple[str, float, str]]:
     """
     with get_connection() as conn:
         c = conn.cursor()
+        # One grouped pass instead of a correlated MAX(date) subquery per row;
+        # SQLite takes the bare columns from the row holding MAX(date)
         c.execute("""
-            SELECT ticker, date, price, COALESCE(currency, 'TRY') as currency FROM fund_prices fp1
-            WHERE date = (SELECT MAX(date) FROM fund_prices fp2 WHERE fp2.ticker = fp1.ticker)
+            SELECT ticker, MAX(date), price, COALESCE(currency, 'TRY') as currency FROM fund_prices
+            GROUP BY ticker
         """)
         results = c.fetchall()
     return {row[0]: (row[1], row[2], row[3]) for row in results}
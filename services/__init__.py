@@ -1,10 +1,32 @@
 """
 Services layer providing business logic abstraction.
+
+Services are imported lazily (PEP 562), so using one service does not load the
+others' dependencies (e.g. plotly for ChartsService).
 """
 
-from services.portfolio import PortfolioService
-from services.rates import RatesService
-from services.charts import ChartsService
-from services.analysis import AnalysisService
+import importlib
+
+# Submodule that defines each exported service
+_EXPORTS = {
+    "PortfolioService": "portfolio",
+    "RatesService": "rates",
+    "ChartsService": "charts",
+    "AnalysisService": "analysis",
+}
 
 __all__ = ["PortfolioService", "RatesService", "ChartsService", "AnalysisService"]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -7,6 +7,8 @@ Uses FIFO (First In, First Out) cost basis for:
 - Calculating unrealized gains on open positions
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 
 import pandas as pd
@@ -14,11 +16,23 @@ import pandas as pd
 from core.database import (
     ASSET_CASH,
     CURRENCY_USD,
+    get_cpi_usd_rates_for_dates,
 )
-from core.analysis import calculate_real_return, get_usd_rate
+from core.analysis import calculate_real_return, fetch_usd_rates_for_dates, get_usd_rate
 from services.fifo import calculate_fifo_all_tickers
 
 
+@dataclass
+class PortfolioAnalysis:
+    """Result of a portfolio analysis run, with how its USD/TRY rates were resolved."""
+
+    details: pd.DataFrame
+    summary: pd.DataFrame
+    status: str
+    rates_fetched: bool = False  # auto_fetch stored new rates (one database commit)
+    rates_missing: bool = False  # some USD/TRY rate could not be resolved
+
+
 class AnalysisService:
     """Service for portfolio analysis and real return calculations using FIFO cost basis."""
 
@@ -39,12 +53,27 @@ class AnalysisService:
         Returns:
             Tuple of (details_table, summary_table, status_message)
         """
+        result = AnalysisService.run_analysis(price_table_df, auto_fetch)
+        return result.details, result.summary, result.status
+
+    @staticmethod
+    def run_analysis(price_table_df: pd.DataFrame | None, auto_fetch: bool = False) -> PortfolioAnalysis:
+        """
+        Analyze portfolio like analyze_portfolio, also reporting how USD/TRY rates were resolved.
+
+        Args:
+            price_table_df: DataFrame with Ticker and Current Price columns
+            auto_fetch: Whether to auto-fetch missing USD rates from yfinance (default: False)
+
+        Returns:
+            PortfolioAnalysis with the tables, status message and rate lookup outcome
+        """
         # Get FIFO results for all tickers
         fifo_results = calculate_fifo_all_tickers()
 
         if not fifo_results:
             empty_msg = pd.DataFrame({"Message": ["No transactions found. Add some in the Transactions tab."]})
-            return empty_msg, empty_msg, ""
+            return PortfolioAnalysis(empty_msg, empty_msg, "")
 
         # Parse current prices from the table (with currency info)
         price_map: dict[str, float] = {}
@@ -63,6 +92,15 @@ class AnalysisService:
         ticker_summary: dict[str, dict] = {}
         today = datetime.now().strftime("%Y-%m-%d")
 
+        # Resolve every USD/TRY rate we will need up front, concurrently.
+        # With auto_fetch each missing date is a yfinance round-trip, and fetched
+        # rates are stored, so the per-lot lookups below become DB hits.
+        rate_dates = {today}
+        for fifo in fifo_results.values():
+            if fifo.asset_type != ASSET_CASH:
+                rate_dates.update(lot.buy_date for lot in fifo.open_lots)
+        usd_rates, rates_fetched = AnalysisService._prefetch_usd_rates(rate_dates, auto_fetch)
+
         # Process each ticker's FIFO results
         for ticker, fifo in fifo_results.items():
             currency = fifo.currency
@@ -123,8 +161,8 @@ class AnalysisService:
 
                     # For USD stocks, convert to TRY for real return calculations
                     # (comparing against TRY inflation benchmarks)
-                    buy_usd_rate = get_usd_rate(buy_date, auto_fetch=auto_fetch) if currency == CURRENCY_USD else None
-                    current_usd_rate = get_usd_rate(today, auto_fetch=auto_fetch) if currency == CURRENCY_USD else None
+                    buy_usd_rate = usd_rates.get(buy_date) if currency == CURRENCY_USD else None
+                    current_usd_rate = usd_rates.get(today) if currency == CURRENCY_USD else None
 
                     if currency == CURRENCY_USD and buy_usd_rate and current_usd_rate:
                         # Convert USD prices to TRY for real return calculation
@@ -219,7 +257,7 @@ class AnalysisService:
                 )
 
         # Get today's USD rate for conversions
-        today_usd = get_usd_rate(today, auto_fetch=auto_fetch)
+        today_usd = usd_rates.get(today)
 
         # Build summary table
         summary_rows = []
@@ -380,7 +418,44 @@ class AnalysisService:
         if "_currency" in summary_df.columns:
             summary_df = summary_df.drop(columns=["_currency"])
 
-        return pd.DataFrame(results), summary_df, "\n".join(status_parts)
+        return PortfolioAnalysis(
+            pd.DataFrame(results),
+            summary_df,
+            "\n".join(status_parts),
+            rates_fetched=rates_fetched,
+            rates_missing=any(rate is None for rate in usd_rates.values()),
+        )
+
+    @staticmethod
+    def _prefetch_usd_rates(dates: set[str], auto_fetch: bool) -> tuple[dict[str, float | None], bool]:
+        """
+        Look up USD/TRY rates for several dates.
+
+        Without auto_fetch the database lookups (with closest-earlier fallback) run in parallel.
+
+        Args:
+            dates: Dates in YYYY-MM-DD format
+            auto_fetch: Whether to auto-fetch missing rates from yfinance
+
+        Returns:
+            Tuple of (dictionary mapping date -> rate (None if unavailable), whether fetched rates were stored)
+        """
+        if not dates:
+            return {}, False
+
+        ordered = sorted(dates)
+        if auto_fetch:
+            # Exact stored rates in one query, then one ranged yfinance download for all missing dates
+            rates = get_cpi_usd_rates_for_dates(ordered)
+            missing = [d for d in ordered if d not in rates]
+            fetched = fetch_usd_rates_for_dates(missing) if missing else {}
+            rates.update(fetched)
+            # fetch_usd_rates_for_dates stores whatever it fetched
+            return {d: rates.get(d) for d in ordered}, bool(fetched)
+
+        with ThreadPoolExecutor(max_workers=min(8, len(ordered))) as executor:
+            rates = list(executor.map(lambda d: get_usd_rate(d, auto_fetch=auto_fetch), ordered))
+        return dict(zip(ordered, rates)), False
 
     @staticmethod
     def _format_real_return(val: float | None) -> str:
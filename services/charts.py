@@ -4,13 +4,47 @@ Charts service for generating fund price charts.
 Uses only database data - no network calls.
 """
 
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
-from core.database import get_fund_prices
+from core.database import get_fund_price_date_range, get_fund_prices, get_fund_prices_wide
 from core.analysis import get_usd_rates_as_dataframe
 
+# Longer series are reduced before plotting to bound the number of WebGL vertices
+_MAX_POINTS = 5000
+
+
+def _minmax_indices(y: np.ndarray, max_points: int = _MAX_POINTS) -> np.ndarray:
+    """
+    Indices of a subset of y with at most about max_points points.
+
+    y is split into max_points // 2 equal buckets and each keeps its lowest and highest
+    point (plus the first and last point overall), so peaks and troughs survive.
+
+    Args:
+        y: Series values in plotting order
+        max_points: Target number of points
+
+    Returns:
+        Sorted indices into y (all of them when y is already short enough)
+    """
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+
+    size = -(-n // (max_points // 2))
+    n_buckets = -(-n // size)
+    blocks = np.full(n_buckets * size, np.nan)
+    blocks[:n] = y
+    blocks = blocks.reshape(n_buckets, size)
+    missing = np.isnan(blocks)
+    offsets = np.arange(n_buckets) * size
+    lows = np.where(missing, np.inf, blocks).argmin(axis=1) + offsets
+    highs = np.where(missing, -np.inf, blocks).argmax(axis=1) + offsets
+    return np.unique(np.concatenate(([0, n - 1], lows, highs)))
+
 
 class ChartsService:
     """Service for generating fund price charts."""
@@ -32,53 +66,53 @@ class ChartsService:
 
         ticker = ticker.upper().strip()
 
-        # Get fund prices
-        prices_df = get_fund_prices(ticker)
+        # Base-date filter runs in SQL so only the charted range is read
+        base_date_str = str(base_date)[:10] if base_date else None
+        prices_df = get_fund_prices(ticker, start_date=base_date_str)
         if prices_df.empty:
+            if base_date_str and get_fund_price_date_range(ticker):
+                return None, f"❌ No price data found for {ticker} from {base_date_str}"
             return None, f"❌ No price data found for {ticker}"
 
-        # Sort by date ascending for charting
-        prices_df = prices_df.sort_values("date", ascending=True)
-
-        # Filter by base date if provided
-        if base_date:
-            base_date_str = str(base_date)[:10]
-            prices_df = prices_df[prices_df["date"] >= base_date_str]
-            if prices_df.empty:
-                return None, f"❌ No price data found for {ticker} from {base_date_str}"
+        # Rows come newest first; reverse for charting
+        prices_df = prices_df.iloc[::-1].reset_index(drop=True)
 
         # Get date range
-        start_date = prices_df["date"].min()
-        end_date = prices_df["date"].max()
+        start_date = prices_df["date"].iloc[0]
+        end_date = prices_df["date"].iloc[-1]
 
         status_parts = []
 
         # Get USD rates from database (no network calls)
         usd_df = get_usd_rates_as_dataframe(start_date, end_date)
 
-        # Merge fund prices with USD rates
-        prices_df["date"] = pd.to_datetime(prices_df["date"])
+        dates = pd.to_datetime(prices_df["date"]).to_numpy()
+        prices = prices_df["price"].to_numpy(dtype="float64")
+
+        # Align each price date with the latest USD rate on or before it (as-of join via searchsorted)
         if not usd_df.empty:
-            usd_df["date"] = pd.to_datetime(usd_df["date"])
-            merged_df = pd.merge_asof(prices_df.sort_values("date"), usd_df.sort_values("date"), on="date", direction="backward")
+            rate_dates = pd.to_datetime(usd_df["date"]).to_numpy()
+            rate_values = usd_df["usd_try_rate"].to_numpy(dtype="float64")
+            idx = np.searchsorted(rate_dates, dates, side="right") - 1
+            rates = np.where(idx >= 0, rate_values[np.maximum(idx, 0)], np.nan)
+            rates[~(rates > 0)] = np.nan
         else:
-            merged_df = prices_df.copy()
-            merged_df["usd_try_rate"] = None
+            rates = np.full(len(prices), np.nan)
 
         # Calculate USD price where we have rates
-        merged_df["price_usd"] = None
-        if "usd_try_rate" in merged_df.columns:
-            mask = merged_df["usd_try_rate"].notna() & (merged_df["usd_try_rate"] > 0)
-            merged_df.loc[mask, "price_usd"] = merged_df.loc[mask, "price"] / merged_df.loc[mask, "usd_try_rate"]
+        price_usd = prices / rates
+        usd_mask = ~np.isnan(price_usd)
 
-        # Create dual-axis chart
+        # Create dual-axis chart (float32 series halve the payload sent to Plotly).
+        # Scattergl draws with WebGL, which stays responsive on multi-year daily series.
         fig = make_subplots(specs=[[{"secondary_y": True}]])
 
         # TRY price line
+        keep = _minmax_indices(prices)
         fig.add_trace(
-            go.Scatter(
-                x=merged_df["date"],
-                y=merged_df["price"],
+            go.Scattergl(
+                x=dates[keep],
+                y=prices[keep].astype(np.float32),
                 name=f"{ticker} (TRY)",
                 line=dict(color="#2E86AB", width=2),
                 hovertemplate="%{x|%Y-%m-%d}<br>TRY: %{y:.4f}<extra></extra>",
@@ -87,12 +121,13 @@ class ChartsService:
         )
 
         # USD price line (where available)
-        usd_data = merged_df[merged_df["price_usd"].notna()]
-        if not usd_data.empty:
+        if usd_mask.any():
+            usd_dates, usd_values = dates[usd_mask], price_usd[usd_mask]
+            keep = _minmax_indices(usd_values)
             fig.add_trace(
-                go.Scatter(
-                    x=usd_data["date"],
-                    y=usd_data["price_usd"],
+                go.Scattergl(
+                    x=usd_dates[keep],
+                    y=usd_values[keep].astype(np.float32),
                     name=f"{ticker} (USD)",
                     line=dict(color="#A23B72", width=2),
                     hovertemplate="%{x|%Y-%m-%d}<br>USD: $%{y:.6f}<extra></extra>",
@@ -108,6 +143,8 @@ class ChartsService:
             hovermode="x unified",
             template="plotly_white",
             height=500,
+            # Keep zoom/pan while the same ticker is redrawn
+            uirevision=ticker,
         )
 
         fig.update_yaxes(title_text="Price (TRY)", secondary_y=False, tickformat=".4f")
@@ -115,7 +152,7 @@ class ChartsService:
 
         # Build status message
         total_prices = len(prices_df)
-        usd_prices = len(usd_data)
+        usd_prices = int(usd_mask.sum())
         status_parts.append(f"📊 {ticker}: {total_prices} price points, {usd_prices} with USD conversion")
 
         if usd_prices < total_prices:
@@ -152,91 +189,79 @@ class ChartsService:
         status_parts = []
         colors = ["#2E86AB", "#A23B72", "#F18F01", "#C73E1D", "#3B1F2B", "#95190C"]
 
-        # Find overall date range
-        all_dates = []
-        for ticker in tickers:
-            prices_df = get_fund_prices(ticker)
-            if not prices_df.empty:
-                if base_date_str:
-                    prices_df = prices_df[prices_df["date"] >= base_date_str]
-                if not prices_df.empty:
-                    all_dates.extend(prices_df["date"].tolist())
-
-        if not all_dates:
+        # One query for all tickers: dates x tickers price matrix (NaN where a fund has no price)
+        dates, matrix, columns = get_fund_prices_wide(tickers, base_date_str)
+
+        if not columns:
             return None, "❌ No price data found for any ticker" + (f" from {base_date_str}" if base_date_str else "")
 
-        start_date = min(all_dates)
-        end_date = max(all_dates)
+        start_date = pd.Timestamp(dates[0]).strftime("%Y-%m-%d")
+        end_date = pd.Timestamp(dates[-1]).strftime("%Y-%m-%d")
 
         # Get USD rates from database (no network calls)
         usd_df = get_usd_rates_as_dataframe(start_date, end_date)
-        if not usd_df.empty:
-            usd_df["date"] = pd.to_datetime(usd_df["date"])
-
-        for i, ticker in enumerate(tickers):
-            prices_df = get_fund_prices(ticker)
-            if prices_df.empty:
-                status_parts.append(f"⚠️ No data for {ticker}")
-                continue
+        use_usd = show_usd and not usd_df.empty
+
+        if use_usd:
+            # Align each price date with the latest USD rate on or before it
+            rate_dates = pd.to_datetime(usd_df["date"]).to_numpy()
+            rate_values = usd_df["usd_try_rate"].to_numpy(dtype="float64")
+            idx = np.searchsorted(rate_dates, dates, side="right") - 1
+            rates = np.where(idx >= 0, rate_values[np.maximum(idx, 0)], np.nan)
+            rates[~(rates > 0)] = np.nan
+            values = matrix / rates[:, None]
+        else:
+            values = matrix
 
-            prices_df = prices_df.sort_values("date", ascending=True)
+        # Normalize every column to 100 at its first available value in one broadcast.
+        # Math stays in float64; traces get float32 copies to halve the payload sent to Plotly.
+        valid = ~np.isnan(values)
+        first_idx = valid.argmax(axis=0)
+        base_values = values[first_idx, np.arange(values.shape[1])]
+        normalized = values / base_values * 100
 
-            # Filter by base date if provided
-            if base_date_str:
-                prices_df = prices_df[prices_df["date"] >= base_date_str]
-                if prices_df.empty:
+        for i, ticker in enumerate(tickers):
+            if ticker not in columns:
+                if base_date_str and get_fund_price_date_range(ticker):
                     status_parts.append(f"⚠️ No data for {ticker} from {base_date_str}")
-                    continue
-
-            prices_df["date"] = pd.to_datetime(prices_df["date"])
+                else:
+                    status_parts.append(f"⚠️ No data for {ticker}")
+                continue
 
+            col = columns.index(ticker)
+            mask = valid[:, col]
             color = colors[i % len(colors)]
+            x, y, raw = dates[mask], normalized[mask, col], values[mask, col]
+            keep = _minmax_indices(y)
 
-            if show_usd and not usd_df.empty:
-                # Merge with USD rates
-                merged_df = pd.merge_asof(prices_df.sort_values("date"), usd_df.sort_values("date"), on="date", direction="backward")
-
-                # Calculate USD price
-                mask = merged_df["usd_try_rate"].notna() & (merged_df["usd_try_rate"] > 0)
-                merged_df = merged_df[mask].copy()
-
-                if merged_df.empty:
+            if use_usd:
+                if not mask.any():
                     status_parts.append(f"⚠️ No USD rates available for {ticker}")
                     continue
 
-                merged_df["price_usd"] = merged_df["price"] / merged_df["usd_try_rate"]
-
-                # Normalize to 100
-                first_price = merged_df["price_usd"].iloc[0]
-                merged_df["normalized"] = (merged_df["price_usd"] / first_price) * 100
-
                 fig.add_trace(
-                    go.Scatter(
-                        x=merged_df["date"],
-                        y=merged_df["normalized"],
+                    go.Scattergl(
+                        x=x[keep],
+                        y=y[keep].astype(np.float32),
                         name=f"{ticker}",
                         line=dict(color=color, width=2),
                         hovertemplate=f"{ticker}<br>%{{x|%Y-%m-%d}}<br>Index: %{{y:.2f}}<br>USD: $%{{customdata:.6f}}<extra></extra>",
-                        customdata=merged_df["price_usd"],
+                        customdata=raw[keep].astype(np.float32),
                     )
                 )
-                status_parts.append(f"✅ {ticker}: {len(merged_df)} points (USD)")
+                status_parts.append(f"✅ {ticker}: {int(mask.sum())} points (USD)")
             else:
-                # TRY only - normalize to 100
-                first_price = prices_df["price"].iloc[0]
-                prices_df["normalized"] = (prices_df["price"] / first_price) * 100
-
                 fig.add_trace(
-                    go.Scatter(
-                        x=prices_df["date"],
-                        y=prices_df["normalized"],
+                    go.Scattergl(
+                        x=x[keep],
+                        y=y[keep].astype(np.float32),
                         name=f"{ticker}",
                         line=dict(color=color, width=2),
                         hovertemplate=f"{ticker}<br>%{{x|%Y-%m-%d}}<br>Index: %{{y:.2f}}<br>TRY: %{{customdata:.4f}}<extra></extra>",
-                        customdata=prices_df["price"],
+                        customdata=raw[keep].astype(np.float32),
                     )
                 )
-                status_parts.append(f"✅ {ticker}: {len(prices_df)} points (TRY)")
+                status_parts.append(f"✅ {ticker}: {int(mask.sum())} points (TRY)")
 
         # Add reference line at 100
         fig.add_hline(y=100, line_dash="dash", line_color="gray", annotation_text="Base (100)")
@@ -251,6 +276,8 @@ class ChartsService:
             hovermode="x unified",
             template="plotly_white",
             height=500,
+            # Keep zoom/pan while the same comparison is redrawn
+            uirevision=f"{','.join(tickers)}|{currency}",
         )
 
         return fig, "\n".join(status_parts)
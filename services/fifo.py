@@ -5,8 +5,10 @@ Handles matching sell transactions to buy transactions in chronological order
 to calculate realized gains/losses and remaining holdings.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
 
 import pandas as pd
 
@@ -72,8 +74,13 @@ def calculate_fifo_for_ticker(df: pd.DataFrame, ticker: str) -> FIFOResult:
     Returns:
         FIFOResult with open lots, closed lots, and summary stats
     """
-    # Filter for this ticker and sort by date ascending (oldest first for FIFO)
-    ticker_df = df[df["ticker"] == ticker].sort_values("date", ascending=True)
+    return _fifo_for_rows(df[df["ticker"] == ticker], ticker)
+
+
+def _fifo_for_rows(ticker_df: pd.DataFrame, ticker: str) -> FIFOResult:
+    """FIFO matching over the transactions of one ticker (rows in any order)."""
+    # Sort by date ascending (oldest first for FIFO)
+    ticker_df = ticker_df.sort_values("date", ascending=True)
 
     if ticker_df.empty:
         return FIFOResult(ticker=ticker, asset_type="", currency="")
@@ -83,23 +90,25 @@ def calculate_fifo_for_ticker(df: pd.DataFrame, ticker: str) -> FIFOResult:
     asset_type = first_row.get("asset_type", "TEFAS")
     currency = first_row.get("currency", "TRY")
 
-    # Track open lots (FIFO queue)
-    open_lots: list[OpenLot] = []
+    # Pull plain Python columns once instead of building a Series per row with iterrows
+    n = len(ticker_df)
+    tx_types = ticker_df["transaction_type"].tolist() if "transaction_type" in ticker_df else [TX_BUY] * n
+    quantities = ticker_df["quantity"].astype("float64").tolist()
+    prices = ticker_df["price_per_share"].astype("float64").fillna(0.0).tolist()
+    dates = ticker_df["date"].tolist()
+    tax_rates = ticker_df["tax_rate"].astype("float64").fillna(0.0).tolist() if "tax_rate" in ticker_df else [0.0] * n
+    tx_ids = ticker_df["id"].astype("int64").tolist()
+
+    # Track open lots (FIFO queue - popleft is O(1), list.pop(0) is O(n))
+    open_lots: deque[OpenLot] = deque()
     closed_lots: list[LotMatch] = []
 
-    for _, row in ticker_df.iterrows():
-        tx_type = row.get("transaction_type", TX_BUY)
-        quantity = float(row["quantity"])
-        price = float(row["price_per_share"]) if pd.notna(row["price_per_share"]) else 0.0
-        date = row["date"]
-        tax_rate = float(row.get("tax_rate", 0)) if pd.notna(row.get("tax_rate")) else 0.0
-        tx_id = int(row["id"])
-
+    for tx_type, quantity, price, tx_date, tax_rate, tx_id in zip(tx_types, quantities, prices, dates, tax_rates, tx_ids):
         if tx_type == TX_BUY:
             # Add new lot to the queue
             lot = OpenLot(
                 buy_id=tx_id,
-                buy_date=date,
+                buy_date=tx_date,
                 buy_price=price,
                 quantity=quantity,
                 remaining_quantity=quantity,
@@ -114,77 +123,43 @@ def calculate_fifo_for_ticker(df: pd.DataFrame, ticker: str) -> FIFOResult:
             # Match sell to oldest lots (FIFO)
             sell_quantity_remaining = quantity
             sell_price = price
-            sell_date = date
+            sell_date = tx_date
+            sell_day = _parse_date(sell_date)
 
             while sell_quantity_remaining > 0 and open_lots:
                 oldest_lot = open_lots[0]
-
-                if oldest_lot.remaining_quantity <= sell_quantity_remaining:
-                    # Fully consume this lot
-                    matched_qty = oldest_lot.remaining_quantity
-                    sell_quantity_remaining -= matched_qty
-
-                    cost_basis = oldest_lot.buy_price * matched_qty
-                    proceeds = sell_price * matched_qty
-                    realized_gain = proceeds - cost_basis
-                    realized_gain_pct = (realized_gain / cost_basis * 100) if cost_basis > 0 else 0
-
-                    # Calculate holding days
-                    buy_dt = datetime.strptime(oldest_lot.buy_date, "%Y-%m-%d")
-                    sell_dt = datetime.strptime(sell_date, "%Y-%m-%d")
-                    holding_days = (sell_dt - buy_dt).days
-
-                    closed_lots.append(
-                        LotMatch(
-                            buy_date=oldest_lot.buy_date,
-                            buy_price=oldest_lot.buy_price,
-                            sell_date=sell_date,
-                            sell_price=sell_price,
-                            quantity=matched_qty,
-                            cost_basis=cost_basis,
-                            proceeds=proceeds,
-                            realized_gain=realized_gain,
-                            realized_gain_pct=realized_gain_pct,
-                            holding_days=holding_days,
-                            tax_rate=oldest_lot.tax_rate,
-                        )
+                # Fully consume this lot, or partially consume it with what is left of the sell
+                fully_consumed = oldest_lot.remaining_quantity <= sell_quantity_remaining
+                matched_qty = oldest_lot.remaining_quantity if fully_consumed else sell_quantity_remaining
+
+                cost_basis = oldest_lot.buy_price * matched_qty
+                proceeds = sell_price * matched_qty
+                realized_gain = proceeds - cost_basis
+                realized_gain_pct = (realized_gain / cost_basis * 100) if cost_basis > 0 else 0
+
+                closed_lots.append(
+                    LotMatch(
+                        buy_date=oldest_lot.buy_date,
+                        buy_price=oldest_lot.buy_price,
+                        sell_date=sell_date,
+                        sell_price=sell_price,
+                        quantity=matched_qty,
+                        cost_basis=cost_basis,
+                        proceeds=proceeds,
+                        realized_gain=realized_gain,
+                        realized_gain_pct=realized_gain_pct,
+                        holding_days=(sell_day - _parse_date(oldest_lot.buy_date)).days,
+                        tax_rate=oldest_lot.tax_rate,
                     )
+                )
 
+                if fully_consumed:
                     # Remove fully consumed lot
-                    open_lots.pop(0)
-
+                    sell_quantity_remaining -= matched_qty
+                    open_lots.popleft()
                 else:
-                    # Partially consume this lot
-                    matched_qty = sell_quantity_remaining
-                    sell_quantity_remaining = 0
-
-                    cost_basis = oldest_lot.buy_price * matched_qty
-                    proceeds = sell_price * matched_qty
-                    realized_gain = proceeds - cost_basis
-                    realized_gain_pct = (realized_gain / cost_basis * 100) if cost_basis > 0 else 0
-
-                    # Calculate holding days
-                    buy_dt = datetime.strptime(oldest_lot.buy_date, "%Y-%m-%d")
-                    sell_dt = datetime.strptime(sell_date, "%Y-%m-%d")
-                    holding_days = (sell_dt - buy_dt).days
-
-                    closed_lots.append(
-                        LotMatch(
-                            buy_date=oldest_lot.buy_date,
-                            buy_price=oldest_lot.buy_price,
-                            sell_date=sell_date,
-                            sell_price=sell_price,
-                            quantity=matched_qty,
-                            cost_basis=cost_basis,
-                            proceeds=proceeds,
-                            realized_gain=realized_gain,
-                            realized_gain_pct=realized_gain_pct,
-                            holding_days=holding_days,
-                            tax_rate=oldest_lot.tax_rate,
-                        )
-                    )
-
                     # Update remaining quantity in lot
+                    sell_quantity_remaining = 0
                     oldest_lot.remaining_quantity -= matched_qty
                     oldest_lot.cost_basis = oldest_lot.buy_price * oldest_lot.remaining_quantity
 
@@ -199,7 +174,7 @@ def calculate_fifo_for_ticker(df: pd.DataFrame, ticker: str) -> FIFOResult:
         ticker=ticker,
         asset_type=asset_type,
         currency=currency,
-        open_lots=open_lots,
+        open_lots=list(open_lots),
         closed_lots=closed_lots,
         total_shares_held=total_shares,
         total_cost_basis=total_cost_basis,
@@ -209,6 +184,12 @@ def calculate_fifo_for_ticker(df: pd.DataFrame, ticker: str) -> FIFOResult:
     )
 
 
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    """Parse a YYYY-MM-DD transaction date (memoized: lots are matched against the same dates repeatedly)."""
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
 def calculate_fifo_all_tickers() -> dict[str, FIFOResult]:
     """
     Calculate FIFO cost basis for all tickers in the portfolio.
@@ -220,13 +201,8 @@ def calculate_fifo_all_tickers() -> dict[str, FIFOResult]:
     if df.empty:
         return {}
 
-    tickers = df["ticker"].unique()
-    results = {}
-
-    for ticker in tickers:
-        results[ticker] = calculate_fifo_for_ticker(df, ticker)
-
-    return results
+    # Split the transactions by ticker in one pass instead of re-filtering the frame per ticker
+    return {ticker: _fifo_for_rows(ticker_df, ticker) for ticker, ticker_df in df.groupby("ticker", sort=False)}
 
 
 def get_open_positions() -> pd.DataFrame:
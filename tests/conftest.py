@@ -15,8 +15,10 @@ def test_db(mocker):
     fd, db_path = tempfile.mkstemp(suffix=".db")
     os.close(fd)
 
-    # Patch settings.database_path in the config module
-    mocker.patch("core.config.settings.database_path", db_path)
+    # Patch database_path on the settings singleton that get_settings() returns
+    from core.config import init_settings
+
+    mocker.patch.object(init_settings(), "database_path", db_path)
 
     # Initialize the database
     from core.database import init_db
@@ -25,12 +27,21 @@ def test_db(mocker):
 
     yield db_path
 
-    # Cleanup: remove the temporary database file
-    try:
-        if os.path.exists(db_path):
-            os.unlink(db_path)
-    except Exception:
-        pass
+    # Cleanup: remove the temporary database file (and its WAL/shared-memory sidecars)
+    for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+        try:
+            if os.path.exists(path):
+                os.unlink(path)
+        except Exception:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_info_cache(mocker, tmp_path):
+    """Point the yfinance info file cache at a per-test directory."""
+    from adapters import yfinance_stocks
+
+    mocker.patch.object(yfinance_stocks._info_cache, "directory", tmp_path / "yf_info")
 
 
 @pytest.fixture
@@ -57,9 +68,9 @@ def sample_tefas_data():
     return data
 
 
-@pytest.fixture
-def sample_yfinance_data():
-    """Create sample yfinance DataFrame for testing."""
+@pytest.fixture(scope="session")
+def _sample_yfinance_frame():
+    """Build the sample yfinance DataFrame once per session."""
     dates = pd.date_range(start="2024-01-01", end="2024-01-10", freq="D")
     data = pd.DataFrame(
         {
@@ -72,3 +83,33 @@ def sample_yfinance_data():
         index=dates,
     )
     return data
+
+
+@pytest.fixture
+def sample_yfinance_data(_sample_yfinance_frame):
+    """Create sample yfinance DataFrame for testing."""
+    return _sample_yfinance_frame.copy()
+
+
+@pytest.fixture(scope="session")
+def make_yfinance_data():
+    """
+    Factory for flat yfinance OHLCV frames: make_yfinance_data(start, end, close=150.0, open_=150.0).
+
+    Every call builds a new frame, so tests may mutate it.
+    """
+
+    def make(start, end, close: float = 150.0, open_: float = 150.0) -> pd.DataFrame:
+        dates = pd.date_range(start=start, end=end, freq="D")
+        return pd.DataFrame(
+            {
+                "Open": [open_] * len(dates),
+                "High": [open_ + 1.0] * len(dates),
+                "Low": [open_ - 1.0] * len(dates),
+                "Close": [close] * len(dates),
+                "Volume": [1000000] * len(dates),
+            },
+            index=dates,
+        )
+
+    return make
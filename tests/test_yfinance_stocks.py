@@ -1,7 +1,9 @@
 """Tests for yfinance stocks adapter."""
 
 from datetime import datetime, timedelta
+import sqlite3
 from unittest.mock import MagicMock, patch
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -61,6 +63,17 @@ class TestFetchStockPrices:
         assert skipped == 0
         assert "No data found" in msg
 
+    def test_fetch_start_after_end_skips_api(self, mocker, test_db):
+        """Test that an empty date range returns early without calling yfinance."""
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker")
+
+        inserted, skipped, msg = yfinance_stocks.fetch_stock_prices(ticker="NVDA", start_date="2024-01-10", end_date="2024-01-01")
+
+        assert inserted == 0
+        assert skipped == 0
+        assert "No data found" in msg
+        yfinance_stocks.yf.Ticker.assert_not_called()
+
     def test_fetch_ticker_normalization(self, mocker, test_db, sample_yfinance_data):
         """Test that ticker is normalized to uppercase."""
         mock_ticker = MagicMock()
@@ -91,8 +104,24 @@ class TestFetchStockPrices:
         assert len(prices_df) == 10
         # Prices should match Close column values (100.5, 101.0, 101.5, etc.)
         expected_prices = [100.5 + i * 0.5 for i in range(10)]
-        actual_prices = sorted(prices_df["price"].tolist())
+        actual_prices = prices_df.sort_values("date")["price"].to_numpy()
         assert len(actual_prices) == len(expected_prices)
+        np.testing.assert_allclose(actual_prices, expected_prices)
+
+    def test_fetch_skips_stored_dates(self, mocker, test_db, sample_yfinance_data):
+        """Test that already stored dates are filtered out before inserting."""
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = sample_yfinance_data.iloc[:4]
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker", return_value=mock_ticker)
+        yfinance_stocks.fetch_stock_prices(ticker="NVDA", start_date="2024-01-01", end_date="2024-01-04")
+
+        mock_ticker.history.return_value = sample_yfinance_data
+        bulk_add = mocker.spy(yfinance_stocks, "bulk_add_fund_prices")
+        inserted, skipped, msg = yfinance_stocks.fetch_stock_prices(ticker="NVDA", start_date="2024-01-01", end_date="2024-01-10")
+
+        assert inserted == 6
+        assert skipped == 4
+        assert len(bulk_add.call_args.args[0]) == 6
 
     def test_fetch_exception_handling(self, mocker, test_db):
         """Test exception handling during fetch."""
@@ -107,6 +136,64 @@ class TestFetchStockPrices:
         assert "Error" in msg
 
 
+class TestFetchStockPricesBulk:
+    """Tests for fetch_stock_prices_bulk function."""
+
+    def test_bulk_download_in_chunks(self, mocker, test_db, sample_yfinance_data):
+        """Test that tickers are downloaded 20 per request and stored per ticker."""
+        tickers = [f"T{i}" for i in range(25)]
+
+        def download(symbols, **kwargs):
+            return pd.concat({symbol: sample_yfinance_data for symbol in symbols.split()}, axis=1)
+
+        mock_download = mocker.patch("adapters.yfinance_stocks.yf.download", side_effect=download)
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker")
+
+        results = yfinance_stocks.fetch_stock_prices_bulk(tickers, "2024-01-01", "2024-01-10")
+
+        assert mock_download.call_count == 2
+        assert [len(c.args[0].split()) for c in mock_download.call_args_list] == [20, 5]
+        assert all(results[t][0] == 10 for t in tickers)
+        yfinance_stocks.yf.Ticker.assert_not_called()
+
+    def test_bulk_falls_back_for_missing_ticker(self, mocker, test_db, sample_yfinance_data):
+        """Test that a ticker missing from the bulk response is fetched on its own."""
+        mocker.patch("adapters.yfinance_stocks.yf.download", return_value=pd.concat({"NVDA": sample_yfinance_data}, axis=1))
+        mock_ticker = MagicMock()
+        mock_ticker.history.return_value = sample_yfinance_data
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker", return_value=mock_ticker)
+
+        results = yfinance_stocks.fetch_stock_prices_bulk(["nvda", "META"], "2024-01-01", "2024-01-10")
+
+        assert results["NVDA"][0] == 10
+        assert results["META"][0] == 10
+        mock_ticker.history.assert_called_once()
+
+    def test_bulk_insert_error_reported_per_ticker(self, mocker, test_db, sample_yfinance_data):
+        """Test that a failed chunk insert is reported for each ticker instead of raising."""
+        mocker.patch("adapters.yfinance_stocks.yf.download", return_value=pd.concat({"NVDA": sample_yfinance_data, "META": sample_yfinance_data}, axis=1))
+        mocker.patch(
+            "adapters.yfinance_stocks.bulk_add_fund_prices_by_ticker",
+            side_effect=sqlite3.OperationalError("database is locked"),
+        )
+
+        results = yfinance_stocks.fetch_stock_prices_bulk(["NVDA", "META"], "2024-01-01", "2024-01-10")
+
+        assert results["NVDA"] == (0, 0, "❌ Error fetching NVDA: database is locked")
+        assert results["META"] == (0, 0, "❌ Error fetching META: database is locked")
+
+    def test_bulk_reports_stored_counts(self, mocker, test_db, sample_yfinance_data):
+        """Test that rows stored concurrently are reported as skipped, not as new."""
+        mocker.patch("adapters.yfinance_stocks.yf.download", return_value=pd.concat({"NVDA": sample_yfinance_data}, axis=1))
+        # Another refresh stores every date after the stored-date filter ran
+        mocker.patch("adapters.yfinance_stocks.get_fund_price_dates", return_value=set())
+        yfinance_stocks.fetch_stock_prices_bulk(["NVDA"], "2024-01-01", "2024-01-10")
+
+        results = yfinance_stocks.fetch_stock_prices_bulk(["NVDA"], "2024-01-01", "2024-01-10")
+
+        assert results["NVDA"][:2] == (0, 10)
+
+
 class TestUpdateStockPrices:
     """Tests for update_stock_prices function."""
 
@@ -122,23 +209,13 @@ class TestUpdateStockPrices:
         assert skipped >= 0
         assert "NVDA" in msg
 
-    def test_update_already_up_to_date(self, mocker, test_db, sample_yfinance_data):
+    def test_update_already_up_to_date(self, mocker, test_db, sample_yfinance_data, make_yfinance_data):
         """Test update when data is already up to date."""
         # First insert some recent data
         today = datetime.now()
         yesterday = today - timedelta(days=1)
 
-        recent_dates = pd.date_range(start=yesterday, end=yesterday, freq="D")
-        recent_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(recent_dates),
-                "High": [151.0] * len(recent_dates),
-                "Low": [149.0] * len(recent_dates),
-                "Close": [150.0] * len(recent_dates),
-                "Volume": [1000000] * len(recent_dates),
-            },
-            index=recent_dates,
-        )
+        recent_data = make_yfinance_data(yesterday, yesterday, close=150.0)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = recent_data
@@ -152,23 +229,13 @@ class TestUpdateStockPrices:
         assert skipped == 0
         assert "up to date" in msg
 
-    def test_update_with_stale_data(self, mocker, test_db, sample_yfinance_data):
+    def test_update_with_stale_data(self, mocker, test_db, sample_yfinance_data, make_yfinance_data):
         """Test update when data is stale."""
         # First insert old data
         today = datetime.now()
         week_ago = today - timedelta(days=7)
 
-        old_dates = pd.date_range(start=week_ago - timedelta(days=5), end=week_ago, freq="D")
-        old_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(old_dates),
-                "High": [151.0] * len(old_dates),
-                "Low": [149.0] * len(old_dates),
-                "Close": [150.0] * len(old_dates),
-                "Volume": [1000000] * len(old_dates),
-            },
-            index=old_dates,
-        )
+        old_data = make_yfinance_data(week_ago - timedelta(days=5), week_ago, close=150.0)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = old_data
@@ -185,23 +252,13 @@ class TestUpdateStockPrices:
         call_args = mock_ticker.history.call_args
         assert call_args is not None
 
-    def test_update_no_new_data_found(self, mocker, test_db):
+    def test_update_no_new_data_found(self, mocker, test_db, make_yfinance_data):
         """Test update when no new data is found."""
         # First insert old data
         today = datetime.now()
         week_ago = today - timedelta(days=7)
 
-        old_dates = pd.date_range(start=week_ago - timedelta(days=5), end=week_ago, freq="D")
-        old_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(old_dates),
-                "High": [151.0] * len(old_dates),
-                "Low": [149.0] * len(old_dates),
-                "Close": [150.0] * len(old_dates),
-                "Volume": [1000000] * len(old_dates),
-            },
-            index=old_dates,
-        )
+        old_data = make_yfinance_data(week_ago - timedelta(days=5), week_ago, close=150.0)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = old_data
@@ -246,20 +303,10 @@ class TestFetchPricesForNewStock:
         assert inserted >= 0
         assert skipped >= 0
 
-    def test_fetch_new_stock_with_existing_data_before_transaction(self, mocker, test_db, sample_yfinance_data):
+    def test_fetch_new_stock_with_existing_data_before_transaction(self, mocker, test_db, sample_yfinance_data, make_yfinance_data):
         """Test fetching when transaction date is before existing data."""
         # First insert data starting from 2024-01-10
-        later_dates = pd.date_range(start="2024-01-10", end="2024-01-20", freq="D")
-        later_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(later_dates),
-                "High": [151.0] * len(later_dates),
-                "Low": [149.0] * len(later_dates),
-                "Close": [150.0] * len(later_dates),
-                "Volume": [1000000] * len(later_dates),
-            },
-            index=later_dates,
-        )
+        later_data = make_yfinance_data("2024-01-10", "2024-01-20", close=150.0)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = later_data
@@ -277,23 +324,20 @@ class TestFetchPricesForNewStock:
 class TestGetCurrentStockPrice:
     """Tests for get_current_stock_price function."""
 
-    def test_get_current_price_recent_data(self, mocker, test_db):
+    @pytest.fixture(autouse=True)
+    def clear_price_cache(self):
+        """Each test uses a fresh database, so memoized prices must not leak between tests."""
+        yfinance_stocks.get_current_stock_price.cache_clear()
+        yield
+        yfinance_stocks.get_current_stock_price.cache_clear()
+
+    def test_get_current_price_recent_data(self, mocker, test_db, make_yfinance_data):
         """Test getting price when data is recent."""
         today = datetime.now()
         yesterday = today - timedelta(days=1)
 
         # Insert recent data
-        recent_dates = pd.date_range(start=yesterday, end=yesterday, freq="D")
-        recent_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(recent_dates),
-                "High": [151.0] * len(recent_dates),
-                "Low": [149.0] * len(recent_dates),
-                "Close": [150.5] * len(recent_dates),
-                "Volume": [1000000] * len(recent_dates),
-            },
-            index=recent_dates,
-        )
+        recent_data = make_yfinance_data(yesterday, yesterday, close=150.5)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = recent_data
@@ -304,23 +348,13 @@ class TestGetCurrentStockPrice:
 
         assert price == 150.5
 
-    def test_get_current_price_stale_data(self, mocker, test_db, sample_yfinance_data):
+    def test_get_current_price_stale_data(self, mocker, test_db, sample_yfinance_data, make_yfinance_data):
         """Test getting price when data is stale and needs update."""
         today = datetime.now()
         week_ago = today - timedelta(days=7)
 
         # Insert old data
-        old_dates = pd.date_range(start=week_ago, end=week_ago, freq="D")
-        old_data = pd.DataFrame(
-            {
-                "Open": [150.0] * len(old_dates),
-                "High": [151.0] * len(old_dates),
-                "Low": [149.0] * len(old_dates),
-                "Close": [150.0] * len(old_dates),
-                "Volume": [1000000] * len(old_dates),
-            },
-            index=old_dates,
-        )
+        old_data = make_yfinance_data(week_ago, week_ago, close=150.0)
 
         mock_ticker = MagicMock()
         mock_ticker.history.return_value = old_data
@@ -328,17 +362,7 @@ class TestGetCurrentStockPrice:
         yfinance_stocks.fetch_stock_prices("NVDA", start_date=week_ago.strftime("%Y-%m-%d"), end_date=week_ago.strftime("%Y-%m-%d"))
 
         # Now return new data when updating
-        new_dates = pd.date_range(start=today, end=today, freq="D")
-        new_data = pd.DataFrame(
-            {
-                "Open": [151.0] * len(new_dates),
-                "High": [152.0] * len(new_dates),
-                "Low": [150.0] * len(new_dates),
-                "Close": [151.0] * len(new_dates),
-                "Volume": [1000000] * len(new_dates),
-            },
-            index=new_dates,
-        )
+        new_data = make_yfinance_data(today, today, close=151.0, open_=151.0)
         mock_ticker.history.return_value = new_data
 
         price = yfinance_stocks.get_current_stock_price("NVDA")
@@ -356,6 +380,16 @@ class TestGetCurrentStockPrice:
 
         assert price is None
 
+    def test_get_current_price_memoized(self, mocker, test_db):
+        """Test that repeated lookups within the TTL do not hit the database again."""
+        mocker.patch("adapters.yfinance_stocks.get_latest_fund_price", return_value=(datetime.now().strftime("%Y-%m-%d"), 150.5, "USD"))
+
+        first = yfinance_stocks.get_current_stock_price("NVDA")
+        second = yfinance_stocks.get_current_stock_price(" nvda ")
+
+        assert first == second == 150.5
+        yfinance_stocks.get_latest_fund_price.assert_called_once()
+
 
 class TestIsValidStock:
     """Tests for is_valid_stock function."""
@@ -408,7 +442,51 @@ class TestIsValidStock:
 
         assert result is True
         # Verify ticker was normalized in the call
-        yfinance_stocks.yf.Ticker.assert_called_with("NVDA")
+        yfinance_stocks.yf.Ticker.assert_called_with("NVDA", session=yfinance_stocks._get_session())
+
+    def test_session_reused(self, mocker):
+        """Test that every Ticker is created with the same shared session."""
+        mock_ticker = MagicMock()
+        mock_ticker.info = {"regularMarketPrice": 150.0}
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker", return_value=mock_ticker)
+
+        yfinance_stocks.is_valid_stock("NVDA")
+        yfinance_stocks.is_valid_stock("META")
+
+        sessions = [call.kwargs["session"] for call in yfinance_stocks.yf.Ticker.call_args_list]
+        assert len(sessions) == 2
+        assert sessions[0] is sessions[1]
+
+
+class TestIsValidStocks:
+    """Tests for is_valid_stocks function."""
+
+    def test_batch_validation(self, mocker):
+        """Test validating several tickers with one yf.Tickers batch."""
+        valid, invalid = MagicMock(), MagicMock()
+        valid.info = {"regularMarketPrice": 150.0}
+        invalid.info = {}
+        mock_batch = MagicMock()
+        mock_batch.tickers = {"NVDA": valid, "INVALID": invalid}
+        mocker.patch("adapters.yfinance_stocks.yf.Tickers", return_value=mock_batch)
+
+        result = yfinance_stocks.is_valid_stocks([" nvda ", "INVALID", "NVDA"])
+
+        assert result == {"NVDA": True, "INVALID": False}
+        yfinance_stocks.yf.Tickers.assert_called_once_with("NVDA INVALID", session=yfinance_stocks._get_session())
+
+    def test_batch_validation_uses_info_cache(self, mocker):
+        """Test that tickers with cached info are not fetched again."""
+        mock_ticker = MagicMock()
+        mock_ticker.info = {"previousClose": 150.0}
+        mocker.patch("adapters.yfinance_stocks.yf.Ticker", return_value=mock_ticker)
+        yfinance_stocks.is_valid_stock("NVDA")
+        mocker.patch("adapters.yfinance_stocks.yf.Tickers")
+
+        result = yfinance_stocks.is_valid_stocks(["NVDA"])
+
+        assert result == {"NVDA": True}
+        yfinance_stocks.yf.Tickers.assert_not_called()
 
 
 class TestGetStockInfo:
@@ -470,4 +548,17 @@ class TestGetStockInfo:
 
         assert info is not None
         assert info["ticker"] == "NVDA"
-        yfinance_stocks.yf.Ticker.assert_called_with("NVDA")
+        yfinance_stocks.yf.Ticker.assert_called_with("NVDA", session=yfinance_stocks._get_session())
+
+    def test_get_stock_info_cache_hit(self, mocker):
+        """Test that a second lookup is served from the info cache without calling yfinance."""
+        mock_ticker = MagicMock()
+        mock_ticker.info = {"shortName": "NVIDIA Corporation", "currency": "USD", "exchange": "NMS", "regularMarketPrice": 150.0}
+        ticker_cls = mocker.patch("adapters.yfinance_stocks.yf.Ticker", return_value=mock_ticker)
+
+        first = yfinance_stocks.get_stock_info("NVDA")
+        ticker_cls.reset_mock()
+        second = yfinance_stocks.get_stock_info(" nvda ")
+
+        assert second == first
+        assert ticker_cls.call_count == 0
@@ -1,8 +1,24 @@
 """
 UI module for Gradio interface.
+
+Submodules are imported lazily (PEP 562) so that importing a single handler
+module does not pull in Gradio and every other handler's dependencies.
 """
 
-from ui.handlers import transactions, rates, charts, analysis
-from ui.interface import create_ui
+import importlib
 
 __all__ = ["transactions", "rates", "charts", "analysis", "create_ui"]
+
+_HANDLER_MODULES = {"transactions", "rates", "charts", "analysis"}
+
+
+def __getattr__(name: str):
+    if name in _HANDLER_MODULES:
+        module = importlib.import_module(f"ui.handlers.{name}")
+    elif name == "create_ui":
+        module = importlib.import_module("ui.interface").create_ui
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = module
+    return module
@@ -1,52 +1,54 @@
 """
 UI Handlers - thin wrappers around services for Gradio event handling.
+
+Handler submodules are imported lazily (PEP 562): importing one of them, or a name
+from this package, loads only the submodule that defines it.
 """
 
-from ui.handlers.transactions import (
-    handle_add_transaction,
-    handle_delete_transaction,
-    refresh_portfolio,
-    handle_refresh_tefas_prices,
-    handle_refresh_prices,
-    get_ticker_price_table,
-    get_unique_tickers,
-)
-from ui.handlers.rates import (
-    handle_add_rate,
-    handle_delete_rate,
-    handle_fetch_rate,
-    handle_bulk_import,
-    refresh_rates,
-    handle_refresh_all_usd_rates,
-    handle_quick_refresh_usd_rates,
-    handle_add_cpi,
-    handle_delete_cpi,
-    handle_bulk_import_cpi,
-    refresh_cpi,
-)
-from ui.handlers.charts import (
-    generate_fund_chart,
-    generate_normalized_chart,
-)
-from ui.handlers.analysis import (
-    analyze_portfolio,
-)
-from ui.handlers.refresh import (
-    handle_refresh_cpi_csv,
-    handle_quick_check_usdtry,
-    handle_long_check_usdtry,
-    handle_quick_check_us_stocks,
-    handle_long_check_us_stocks,
-    handle_quick_check_tefas,
-    handle_long_check_tefas,
-)
+import importlib
+
+# Submodule that defines each exported name
+_EXPORTS = {
+    "handle_add_transaction": "transactions",
+    "handle_delete_transaction": "transactions",
+    "refresh_portfolio": "transactions",
+    "handle_refresh_prices": "transactions",
+    "get_ticker_price_table": "transactions",
+    "get_unique_tickers": "transactions",
+    "handle_add_rate": "rates",
+    "handle_delete_rate": "rates",
+    "handle_fetch_rate": "rates",
+    "handle_bulk_import": "rates",
+    "refresh_rates": "rates",
+    "handle_refresh_all_usd_rates": "rates",
+    "handle_quick_refresh_usd_rates": "rates",
+    "handle_add_cpi": "rates",
+    "handle_delete_cpi": "rates",
+    "handle_bulk_import_cpi": "rates",
+    "refresh_cpi": "rates",
+    "generate_fund_chart": "charts",
+    "generate_normalized_chart": "charts",
+    "analyze_portfolio": "analysis",
+    "handle_refresh_cpi_csv": "refresh",
+    "handle_quick_check_usdtry": "refresh",
+    "handle_long_check_usdtry": "refresh",
+    "handle_quick_check_us_stocks": "refresh",
+    "handle_long_check_us_stocks": "refresh",
+    "handle_quick_check_tefas": "refresh",
+    "handle_long_check_tefas": "refresh",
+    "handle_refresh_all_quick": "refresh",
+    "DEFAULT_PAGE_SIZE": "pagination",
+    "TABLE_CSS": "pagination",
+    "html_table": "pagination",
+    "paginated_df": "pagination",
+    "with_pagination": "pagination",
+}
 
 __all__ = [
     # Transaction handlers
     "handle_add_transaction",
     "handle_delete_transaction",
     "refresh_portfolio",
-    "handle_refresh_tefas_prices",
     "handle_refresh_prices",
     "get_ticker_price_table",
     "get_unique_tickers",
@@ -75,4 +77,25 @@ __all__ = [
     "handle_long_check_us_stocks",
     "handle_quick_check_tefas",
     "handle_long_check_tefas",
+    "handle_refresh_all_quick",
+    # Pagination
+    "DEFAULT_PAGE_SIZE",
+    "TABLE_CSS",
+    "html_table",
+    "paginated_df",
+    "with_pagination",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
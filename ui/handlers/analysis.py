@@ -2,14 +2,34 @@
 Analysis handlers for Gradio UI.
 """
 
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import date
+
 import pandas as pd
 
-from services import AnalysisService
+from core.database import get_data_version
+from services.analysis import AnalysisService
+
+# Results of recent analyses, keyed by price table contents, auto_fetch, database version and day
+_ANALYSIS_CACHE_SIZE = 8
+_analysis_cache: OrderedDict[tuple, tuple[pd.DataFrame, pd.DataFrame, str]] = OrderedDict()
+# Handlers run concurrently on the Gradio queue; lookups, inserts and evictions must not interleave
+_analysis_cache_lock = threading.Lock()
+
+
+def _analysis_key(price_table_df: pd.DataFrame, auto_fetch: bool, data_version: int) -> tuple:
+    """Content-addressed cache key; any committed database write bumps the data version part."""
+    digest = hashlib.blake2b(pd.util.hash_pandas_object(price_table_df).to_numpy().tobytes(), digest_size=16).digest()
+    # Holding periods and today's rate depend on the current day
+    return digest, tuple(price_table_df.columns), bool(auto_fetch), data_version, date.today()
 
 
 def analyze_portfolio(price_table_df: pd.DataFrame, auto_fetch: bool = False) -> tuple[pd.DataFrame, pd.DataFrame, str]:
     """
     Analyze portfolio with current prices and calculate real returns.
+    Repeated calls with the same prices and unchanged data are served from a small cache.
 
     Args:
         price_table_df: DataFrame with Ticker and Current Price columns
@@ -18,4 +38,31 @@ def analyze_portfolio(price_table_df: pd.DataFrame, auto_fetch: bool = False) ->
     Returns:
         Tuple of (details_table, summary_table, status_message)
     """
-    return AnalysisService.analyze_portfolio(price_table_df, auto_fetch)
+    if price_table_df is None:
+        return AnalysisService.analyze_portfolio(price_table_df, auto_fetch)
+
+    start_version = get_data_version()
+    key = _analysis_key(price_table_df, auto_fetch, start_version)
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+
+    if cached is None:
+        # Computed outside the lock so a slow analysis does not block other lookups
+        result = AnalysisService.run_analysis(price_table_df, auto_fetch)
+        cached = result.details, result.summary, result.status
+
+        # The result matches the data at the end of the run only if the run's own rate fetch (one
+        # commit) was the only write; a write from another handler may have landed after our reads.
+        # auto_fetch runs with rates still missing (e.g. yfinance failed) are retried on the next click.
+        end_version = get_data_version()
+        if end_version == start_version + result.rates_fetched and not (auto_fetch and result.rates_missing):
+            key = _analysis_key(price_table_df, auto_fetch, end_version)
+            with _analysis_cache_lock:
+                _analysis_cache[key] = cached
+                while len(_analysis_cache) > _ANALYSIS_CACHE_SIZE:
+                    _analysis_cache.popitem(last=False)
+
+    details, summary, status = cached
+    return details.copy(), summary.copy(), status
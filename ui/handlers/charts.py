@@ -4,7 +4,7 @@ Chart handlers for Gradio UI.
 
 import plotly.graph_objects as go
 
-from services import ChartsService
+from services.charts import ChartsService
 
 
 def generate_fund_chart(ticker: str, base_date: str | None = None) -> tuple[go.Figure | None, str]:
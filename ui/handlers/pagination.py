@@ -0,0 +1,93 @@
+"""
+Pagination helpers for large Gradio tables.
+
+Only the requested page of a table is sent to the browser, so refreshing the
+transactions, CPI or USD/TRY tables moves O(page_size) rows instead of all of them.
+Read-only tables can additionally be rendered server-side to one HTML string.
+"""
+
+import inspect
+from collections.abc import Callable
+
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 200
+
+# Scoped to the gr.HTML component that shows an html_table
+TABLE_CSS = """
+table.compact { border-collapse: collapse; width: 100%; font-size: 0.875rem; font-variant-numeric: tabular-nums; }
+table.compact th, table.compact td { padding: 2px 8px; border-bottom: 1px solid var(--border-color-primary); text-align: right; }
+table.compact th { position: sticky; top: 0; background: var(--background-fill-secondary); }
+"""
+
+
+def paginated_df(df: pd.DataFrame, page: int | float | None, page_size: int | float | None = DEFAULT_PAGE_SIZE) -> pd.DataFrame:
+    """
+    Return one page of a DataFrame.
+
+    Args:
+        df: Full table
+        page: 1-based page number (values below 1 show the first page)
+        page_size: Rows per page
+
+    Returns:
+        The rows of the requested page
+    """
+    size = max(int(page_size or DEFAULT_PAGE_SIZE), 1)
+    start = (max(int(page or 1), 1) - 1) * size
+    return df.iloc[start : start + size]
+
+
+def html_table(df: pd.DataFrame) -> str:
+    """
+    Render a read-only table as a compact HTML string.
+
+    Args:
+        df: Table to render (usually one page)
+
+    Returns:
+        HTML for a gr.HTML component styled with TABLE_CSS
+    """
+    if df.empty:
+        return "<p><em>No data</em></p>"
+    return df.to_html(classes="compact", index=False, float_format="%.4f", na_rep="", border=0)
+
+
+def _paginate_result(result, page, page_size, render):
+    """Slice the DataFrame in a handler result (a bare frame or the last item of a tuple)."""
+    if isinstance(result, pd.DataFrame):
+        return render(paginated_df(result, page, page_size))
+    if isinstance(result, tuple) and result and isinstance(result[-1], pd.DataFrame):
+        return (*result[:-1], render(paginated_df(result[-1], page, page_size)))
+    # e.g. gr.update() to keep the displayed table
+    return result
+
+
+def _identity(df: pd.DataFrame) -> pd.DataFrame:
+    return df
+
+
+def with_pagination(fn: Callable, render: Callable[[pd.DataFrame], object] | None = None) -> Callable:
+    """
+    Wrap a table handler so it takes (page, page_size) as two extra trailing
+    arguments and returns only that page of its DataFrame.
+
+    Works for sync and async handlers returning a DataFrame or (..., DataFrame).
+    If render is given (e.g. html_table), it is applied to the page before returning.
+    """
+    render = render or _identity
+    if inspect.iscoroutinefunction(fn):
+
+        async def wrapper(*args):
+            *fn_args, page, page_size = args
+            return _paginate_result(await fn(*fn_args), page, page_size, render)
+
+    else:
+
+        def wrapper(*args):
+            *fn_args, page, page_size = args
+            return _paginate_result(fn(*fn_args), page, page_size, render)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
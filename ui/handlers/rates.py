@@ -2,9 +2,11 @@
 Rate handlers for Gradio UI (USD/TRY and CPI).
 """
 
+import asyncio
+
 import pandas as pd
 
-from services import RatesService
+from services.rates import RatesService
 
 
 # ============== USD/TRY RATE HANDLERS ==============
@@ -25,9 +27,9 @@ def handle_fetch_rate(date: str) -> tuple[str, pd.DataFrame]:
     return RatesService.fetch_usd_rate(date)
 
 
-def handle_bulk_import(csv_text: str) -> tuple[str, pd.DataFrame]:
-    """Handle bulk import of CPI/USD rates."""
-    return RatesService.bulk_import_usd_rates(csv_text)
+async def handle_bulk_import(csv_text: str) -> tuple[str, pd.DataFrame]:
+    """Handle bulk import of CPI/USD rates (parsed and inserted in a worker thread)."""
+    return await asyncio.to_thread(RatesService.bulk_import_usd_rates, csv_text)
 
 
 def refresh_rates() -> pd.DataFrame:
@@ -58,9 +60,9 @@ def handle_delete_cpi(cpi_id: int) -> tuple[str, pd.DataFrame]:
     return RatesService.delete_cpi(cpi_id)
 
 
-def handle_bulk_import_cpi(csv_text: str) -> tuple[str, pd.DataFrame]:
-    """Handle bulk import of CPI data."""
-    return RatesService.bulk_import_cpi(csv_text)
+async def handle_bulk_import_cpi(csv_text: str) -> tuple[str, pd.DataFrame]:
+    """Handle bulk import of CPI data (parsed and inserted in a worker thread)."""
+    return await asyncio.to_thread(RatesService.bulk_import_cpi, csv_text)
 
 
 def refresh_cpi() -> pd.DataFrame:
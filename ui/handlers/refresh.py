@@ -2,25 +2,47 @@
 Refresh handlers for manual data import and API checks.
 """
 
+import asyncio
+
 import pandas as pd
-from datetime import datetime, timedelta
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import date, timedelta
 
 from adapters.tefas import update_fund_prices, fetch_fund_prices
-from adapters.yfinance_stocks import update_stock_prices, fetch_stock_prices
+from adapters.yfinance_stocks import _normalize_ticker, update_stock_prices_bulk, fetch_stock_prices
 from core.analysis import fetch_usd_rates_for_date_range
+from core.config import get_settings
 from core.database import (
+    get_connection,
     get_cpi_usd_rates,
     get_latest_fund_price,
-    get_tickers_with_info,
     ASSET_TEFAS,
     ASSET_USD_STOCK,
     bulk_import_cpi_official,
     get_cpi_official_data,
 )
 from core.log import get_logger
+from ui.handlers.rates import handle_quick_refresh_usd_rates
+from ui.handlers.transactions import get_tickers_with_info
 
 logger = get_logger("refresh")
 
+_FIVE_YEARS = timedelta(days=365 * 5)
+_ONE_DAY = timedelta(days=1)
+
+
+def _parse_iso(value: str) -> date:
+    """Parse a stored YYYY-MM-DD date by slicing (much cheaper than strptime)."""
+    return date(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+def _iso(value: date) -> str:
+    """Format a date as YYYY-MM-DD."""
+    return value.isoformat()
+
+
 # ============== CPI CSV IMPORT ==============
 
 
@@ -33,62 +55,180 @@ def handle_refresh_cpi_csv(csv_text: str) -> tuple[str, pd.DataFrame]:
 # ============== USDTRY RATES ==============
 
 
-def handle_quick_check_usdtry() -> tuple[str, pd.DataFrame]:
+def handle_quick_check_usdtry() -> tuple[str, pd.DataFrame | None]:
     """
     Quick check: Update USDTRY rates from latest stored date to today.
-    """
-    from core.database import get_connection
 
+    Returns:
+        Tuple of (status message, rates table). The table is None when the rates
+        were already up to date, so the caller can keep the one it is showing.
+    """
+    # One connection for both the latest-date lookup and the final table read
     with get_connection() as conn:
         c = conn.cursor()
         c.execute("SELECT MAX(date) FROM cpi_usd_rates")
         latest_date = c.fetchone()[0]
 
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    if latest_date is None:
-        # No rates in database, fetch 5 years
-        start_date = (datetime.now() - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
-        new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
-        status = f"📅 No rates found. Fetched 5 years: {start_date} → {today}\n{msg}"
-    else:
-        # Fetch from day after latest to today
-        start_date = (datetime.strptime(latest_date, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
-        if start_date > today:
-            status = f"✅ Already up to date (latest: {latest_date})"
-        else:
+        today_d = date.today()
+        today = _iso(today_d)
+
+        if latest_date is None:
+            # No rates in database, fetch 5 years
+            start_date = _iso(today_d - _FIVE_YEARS)
             new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
-            status = f"📅 Quick check: {start_date} → {today}\n{msg}"
+            status = f"📅 No rates found. Fetched 5 years: {start_date} → {today}\n{msg}"
+        else:
+            # Fetch from day after latest to today
+            start_date = _iso(_parse_iso(latest_date) + _ONE_DAY)
+            if start_date > today:
+                # Nothing changed - skip re-reading the whole table
+                return f"✅ Already up to date (latest: {latest_date})", None
+            else:
+                new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
+                status = f"📅 Quick check: {start_date} → {today}\n{msg}"
 
-    return status, get_cpi_usd_rates()
+        return status, get_cpi_usd_rates(conn)
 
 
-def handle_long_check_usdtry() -> tuple[str, pd.DataFrame]:
+def handle_long_check_usdtry() -> tuple[str, pd.DataFrame | None]:
     """
     Long check: Update USDTRY rates - 5 years if no entry, otherwise from latest date with 5 historical values.
-    """
-    from core.database import get_connection
 
+    Returns:
+        Tuple of (status message, rates table). The table is None when no rates
+        were written, so the caller can keep the one it is showing.
+    """
+    # One connection for both the latest-date lookup and the final table read
     with get_connection() as conn:
         c = conn.cursor()
         c.execute("SELECT MAX(date) FROM cpi_usd_rates")
         latest_date = c.fetchone()[0]
 
-    today = datetime.now().strftime("%Y-%m-%d")
+        today_d = date.today()
+        today = _iso(today_d)
+
+        if latest_date is None:
+            # No rates in database, fetch 5 years
+            start_date = _iso(today_d - _FIVE_YEARS)
+            new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
+            status = f"📅 No rates found. Fetched 5 years: {start_date} → {today}\n{msg}"
+        else:
+            # Fetch from 5 years before latest date to today (ensures 5 years of history)
+            start_date = _iso(_parse_iso(latest_date) - _FIVE_YEARS)
+            new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
+            status = f"📅 Long check: Fetched 5 years from {start_date} → {today}\n{msg}"
+
+        if new_count == 0:
+            # Nothing stored - skip re-reading and re-sending the whole table
+            return status, None
+        return status, get_cpi_usd_rates(conn)
+
+
+# ============== PER-TICKER FAN-OUT ==============
+
+# Per-ticker refreshes are network-bound; run them concurrently (pool size: settings.refresh_max_workers)
+_TICKER_TIMEOUT = 30
+
+
+def _update_one_stock(info: dict, mode: str, today: str) -> tuple[int, int, str]:
+    """Refresh one US stock over 5 years of history (quick checks go through update_stock_prices_bulk)."""
+    ticker = info["ticker"]
+    latest = get_latest_fund_price(ticker)
+    if latest is None:
+        # No data exists, fetch 5 years
+        return fetch_stock_prices(ticker, years_back=5, end_date=today)
+
+    # Fetch from 5 years before latest date to today
+    latest_date, _, _ = latest
+    start_date = _iso(_parse_iso(latest_date) - _FIVE_YEARS)
+    return fetch_stock_prices(ticker, start_date=start_date, end_date=today)
+
+
+def _update_one_fund(info: dict, mode: str, today: str) -> tuple[int, int, str]:
+    """Refresh one TEFAS fund: 'quick' updates from the latest stored date, 'long' fetches 5 years."""
+    ticker = info["ticker"]
+    if mode == "quick":
+        return update_fund_prices(ticker)
+
+    latest = get_latest_fund_price(ticker)
+    if latest is None:
+        # No data exists, fetch 5 years
+        return fetch_fund_prices(ticker, years_back=5, end_date=today)
+
+    # Fetch from 5 years before latest date to today
+    latest_date, _, _ = latest
+    start_date = _iso(_parse_iso(latest_date) - _FIVE_YEARS)
+    return fetch_fund_prices(ticker, start_date=start_date, end_date=today)
+
+
+def _partition_by_asset(tickers_info: list[dict]) -> defaultdict[str, list[dict]]:
+    """Group ticker info dicts by asset type in a single pass (missing types map to [])."""
+    buckets: defaultdict[str, list[dict]] = defaultdict(list)
+    for info in tickers_info:
+        buckets[info["asset_type"]].append(info)
+    return buckets
 
-    if latest_date is None:
-        # No rates in database, fetch 5 years
-        start_date = (datetime.now() - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
-        new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
-        status = f"📅 No rates found. Fetched 5 years: {start_date} → {today}\n{msg}"
-    else:
-        # Fetch from 5 years before latest date to today (ensures 5 years of history)
-        latest_dt = datetime.strptime(latest_date, "%Y-%m-%d")
-        start_date = (latest_dt - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
-        new_count, msg = fetch_usd_rates_for_date_range(start_date, today)
-        status = f"📅 Long check: Fetched 5 years from {start_date} → {today}\n{msg}"
 
-    return status, get_cpi_usd_rates()
+def _run_per_ticker(worker: Callable[[dict, str, str], tuple[int, int, str]], infos: list[dict], mode: str, today: str) -> tuple[list[str], list[str], int]:
+    """
+    Run worker for every ticker on a thread pool.
+
+    Args:
+        worker: _update_one_stock or _update_one_fund
+        infos: Ticker info dicts (from get_tickers_with_info)
+        mode: 'quick' or 'long'
+        today: Today's date (YYYY-MM-DD), computed once by the calling handler
+
+    Returns:
+        Tuple of (tickers, per-ticker messages, total inserted count), both lists in input order
+    """
+    tickers: list[str] = []
+    msgs = [""] * len(infos)
+    total_inserted = 0
+
+    executor = ThreadPoolExecutor(max_workers=max(1, get_settings().refresh_max_workers))
+    try:
+        futures = [executor.submit(worker, info, mode, today) for info in infos]
+        for i, (info, future) in enumerate(zip(infos, futures)):
+            ticker = info["ticker"]
+            tickers.append(ticker)
+            try:
+                inserted, skipped, msg = future.result(timeout=_TICKER_TIMEOUT)
+            except FuturesTimeoutError:
+                logger.warning(f"{mode} check for {ticker} timed out after {_TICKER_TIMEOUT}s")
+                msgs[i] = f"⚠️ Timed out after {_TICKER_TIMEOUT}s"
+                continue
+            except Exception as e:
+                logger.warning(f"{mode} check for {ticker} failed: {e}")
+                msgs[i] = f"⚠️ {e}"
+                continue
+            total_inserted += inserted
+            msgs[i] = msg
+    finally:
+        # Don't wait for timed-out workers; they finish (and store their rows) in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return tickers, msgs, total_inserted
+
+
+try:
+    # Arrow-backed strings are more compact than Python-object columns
+    import pyarrow  # noqa: F401
+
+    _STATUS_DTYPE = "string[pyarrow]"
+except ImportError:
+    _STATUS_DTYPE = "string"
+
+
+def _status_lines(tickers: list[str], msgs: list[str]) -> list[str]:
+    """Prefix each message with its ticker, in one pass once all workers are done."""
+    return [f"{ticker}: {msg}" for ticker, msg in zip(tickers, msgs)]
+
+
+def _status_frame(tickers: list[str], results: list[str]) -> pd.DataFrame:
+    """Build the Ticker/Status table from row tuples, with string (not object) columns."""
+    frame = pd.DataFrame.from_records(list(zip(tickers, results)), columns=["Ticker", "Status"])
+    return frame.astype(_STATUS_DTYPE)
 
 
 # ============== US STOCKS ==============
@@ -98,58 +238,36 @@ def handle_quick_check_us_stocks() -> tuple[str, pd.DataFrame]:
     """
     Quick check: Update US stock prices from latest stored date to today for each ticker.
     """
-    tickers_info = get_tickers_with_info()
-    us_stocks = [info for info in tickers_info if info["asset_type"] == ASSET_USD_STOCK]
+    us_stocks = _partition_by_asset(get_tickers_with_info())[ASSET_USD_STOCK]
     logger.info(f"Quick check US stocks: {us_stocks}")
     if not us_stocks:
         return "⚠️ No US stocks found in portfolio", pd.DataFrame()
 
-    results = []
-    total_inserted = 0
-
-    for info in us_stocks:
-        ticker = info["ticker"]
-        inserted, skipped, msg = update_stock_prices(ticker)
-        total_inserted += inserted
-        results.append(f"{ticker}: {msg}")
+    # Tickers sharing a start date are downloaded together, 20 symbols per request
+    tickers = [info["ticker"] for info in us_stocks]
+    outcomes = update_stock_prices_bulk(tickers)
+    msgs = [outcomes.get(_normalize_ticker(ticker), (0, 0, "⚠️ No result"))[2] for ticker in tickers]
+    results = _status_lines(tickers, msgs)
 
     status = "📈 Quick check completed\n" + "\n".join(results)
-    return status, pd.DataFrame({"Ticker": [info["ticker"] for info in us_stocks], "Status": results})
+    return status, _status_frame(tickers, results)
 
 
 def handle_long_check_us_stocks() -> tuple[str, pd.DataFrame]:
     """
     Long check: Update US stock prices - 5 years if no entry, otherwise from latest date with 5 years history.
     """
-    tickers_info = get_tickers_with_info()
-    us_stocks = [info for info in tickers_info if info["asset_type"] == ASSET_USD_STOCK]
+    us_stocks = _partition_by_asset(get_tickers_with_info())[ASSET_USD_STOCK]
 
     if not us_stocks:
         return "⚠️ No US stocks found in portfolio", pd.DataFrame()
 
-    results = []
-    total_inserted = 0
-    today = datetime.now().strftime("%Y-%m-%d")
-
-    for info in us_stocks:
-        ticker = info["ticker"]
-        latest = get_latest_fund_price(ticker)
-
-        if latest is None:
-            # No data exists, fetch 5 years
-            inserted, skipped, msg = fetch_stock_prices(ticker, years_back=5, end_date=today)
-        else:
-            # Fetch from 5 years before latest date to today
-            latest_date, _, _ = latest
-            latest_dt = datetime.strptime(latest_date, "%Y-%m-%d")
-            start_date = (latest_dt - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
-            inserted, skipped, msg = fetch_stock_prices(ticker, start_date=start_date, end_date=today)
-
-        total_inserted += inserted
-        results.append(f"{ticker}: {msg}")
+    today = _iso(date.today())
+    tickers, msgs, total_inserted = _run_per_ticker(_update_one_stock, us_stocks, "long", today)
+    results = _status_lines(tickers, msgs)
 
     status = "📈 Long check completed (5 years history)\n" + "\n".join(results)
-    return status, pd.DataFrame({"Ticker": [info["ticker"] for info in us_stocks], "Status": results})
+    return status, _status_frame(tickers, results)
 
 
 # ============== TEFAS STOCKS ==============
@@ -159,55 +277,50 @@ def handle_quick_check_tefas() -> tuple[str, pd.DataFrame]:
     """
     Quick check: Update TEFAS fund prices from latest stored date to today for each ticker.
     """
-    tickers_info = get_tickers_with_info()
-    tefas_funds = [info for info in tickers_info if info["asset_type"] == ASSET_TEFAS]
+    tefas_funds = _partition_by_asset(get_tickers_with_info())[ASSET_TEFAS]
 
     if not tefas_funds:
         return "⚠️ No TEFAS funds found in portfolio", pd.DataFrame()
 
-    results = []
-    total_inserted = 0
-
-    for info in tefas_funds:
-        ticker = info["ticker"]
-        inserted, skipped, msg = update_fund_prices(ticker)
-        total_inserted += inserted
-        results.append(f"{ticker}: {msg}")
+    today = _iso(date.today())
+    tickers, msgs, total_inserted = _run_per_ticker(_update_one_fund, tefas_funds, "quick", today)
+    results = _status_lines(tickers, msgs)
 
     status = "📈 Quick check completed\n" + "\n".join(results)
-    return status, pd.DataFrame({"Ticker": [info["ticker"] for info in tefas_funds], "Status": results})
+    return status, _status_frame(tickers, results)
 
 
 def handle_long_check_tefas() -> tuple[str, pd.DataFrame]:
     """
     Long check: Update TEFAS fund prices - 5 years if no entry, otherwise from latest date with 5 years history.
     """
-    tickers_info = get_tickers_with_info()
-    tefas_funds = [info for info in tickers_info if info["asset_type"] == ASSET_TEFAS]
+    tefas_funds = _partition_by_asset(get_tickers_with_info())[ASSET_TEFAS]
 
     if not tefas_funds:
         return "⚠️ No TEFAS funds found in portfolio", pd.DataFrame()
 
-    results = []
-    total_inserted = 0
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = _iso(date.today())
+    tickers, msgs, total_inserted = _run_per_ticker(_update_one_fund, tefas_funds, "long", today)
+    results = _status_lines(tickers, msgs)
 
-    for info in tefas_funds:
-        ticker = info["ticker"]
-        latest = get_latest_fund_price(ticker)
+    status = "📈 Long check completed (5 years history)\n" + "\n".join(results)
+    return status, _status_frame(tickers, results)
 
-        if latest is None:
-            # No data exists, fetch 5 years
-            inserted, skipped, msg = fetch_fund_prices(ticker, years_back=5, end_date=today)
-        else:
-            # Fetch from 5 years before latest date to today
-            latest_date, _, _ = latest
-            latest_dt = datetime.strptime(latest_date, "%Y-%m-%d")
-            start_date = (latest_dt - timedelta(days=365 * 5)).strftime("%Y-%m-%d")
-            inserted, skipped, msg = fetch_fund_prices(ticker, start_date=start_date, end_date=today)
 
-        total_inserted += inserted
-        results.append(f"{ticker}: {msg}")
+# ============== ALL SOURCES ==============
 
-    status = "📈 Long check completed (5 years history)\n" + "\n".join(results)
-    return status, pd.DataFrame({"Ticker": [info["ticker"] for info in tefas_funds], "Status": results})
+
+async def handle_refresh_all_quick() -> tuple[str, str, str, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Quick refresh of USD/TRY rates, US stocks and TEFAS funds in one go.
+    The three sources are independent network fetches, so they run concurrently in worker threads.
+
+    Returns:
+        Tuple of (rates status, US stocks status, TEFAS status, US stocks table, TEFAS table, rates table)
+    """
+    (rate_status, rates), (us_status, us_table), (tefas_status, tefas_table) = await asyncio.gather(
+        asyncio.to_thread(handle_quick_refresh_usd_rates),
+        asyncio.to_thread(handle_quick_check_us_stocks),
+        asyncio.to_thread(handle_quick_check_tefas),
+    )
+    return rate_status, us_status, tefas_status, us_table, tefas_table, rates
@@ -2,36 +2,41 @@
 Transaction handlers for Gradio UI.
 """
 
+from functools import lru_cache
+
 import pandas as pd
 
-from core.database import ASSET_TEFAS, ASSET_USD_STOCK, ASSET_CASH, TX_BUY, TX_SELL
-from services import PortfolioService
+from core.database import ASSET_TEFAS, ASSET_USD_STOCK, ASSET_CASH, TX_BUY, TX_SELL, get_data_version
+from services.portfolio import PortfolioService
+
+# Map UI labels to asset type constants
+_ASSET_TYPE_MAP: dict[str, str] = {
+    "TEFAS Fund (TRY)": ASSET_TEFAS,
+    "US Stock (USD)": ASSET_USD_STOCK,
+    "Cash (TRY)": ASSET_CASH,
+    "Cash (USD)": ASSET_CASH,
+}
+
+# Map UI labels to transaction type constants
+_TX_TYPE_MAP: dict[str, str] = {
+    "Buy": TX_BUY,
+    "Sell": TX_SELL,
+}
+
+# Cash positions use their currency as the ticker
+_CASH_TICKER_MAP: dict[str, str] = {
+    "Cash (TRY)": "TRY",
+    "Cash (USD)": "USD",
+}
 
 
 def handle_add_transaction(date: str, ticker: str, qty: float, tax_rate: float, notes: str, asset_type: str, transaction_type: str = "Buy", buy_price: float | None = None) -> tuple[str, pd.DataFrame]:
     """Handle adding a new transaction (buy or sell). Price can be manually entered or auto-fetched."""
-    # Map UI labels to asset type constants
-    asset_type_map = {
-        "TEFAS Fund (TRY)": ASSET_TEFAS,
-        "US Stock (USD)": ASSET_USD_STOCK,
-        "Cash (TRY)": ASSET_CASH,
-        "Cash (USD)": ASSET_CASH,
-    }
-
-    # Map UI labels to transaction type constants
-    tx_type_map = {
-        "Buy": TX_BUY,
-        "Sell": TX_SELL,
-    }
-
-    mapped_asset_type = asset_type_map.get(asset_type, ASSET_TEFAS)
-    mapped_tx_type = tx_type_map.get(transaction_type, TX_BUY)
+    mapped_asset_type = _ASSET_TYPE_MAP.get(asset_type, ASSET_TEFAS)
+    mapped_tx_type = _TX_TYPE_MAP.get(transaction_type, TX_BUY)
 
     # For cash, set the ticker to the currency
-    if "Cash (TRY)" in asset_type:
-        ticker = "TRY"
-    elif "Cash (USD)" in asset_type:
-        ticker = "USD"
+    ticker = _CASH_TICKER_MAP.get(asset_type, ticker)
 
     # Convert buy_price: if None or 0, pass None; otherwise pass the value
     price = float(buy_price) if buy_price is not None and buy_price > 0 else None
@@ -63,16 +68,36 @@ def handle_refresh_prices() -> tuple[str, pd.DataFrame]:
     return PortfolioService.refresh_prices()
 
 
-def handle_refresh_tefas_prices() -> tuple[str, pd.DataFrame]:
-    """Refresh prices for all tickers in portfolio."""
-    return PortfolioService.refresh_prices()
+# Tickers (and their asset info) and latest prices only change when transactions or prices are written.
+# Each cache is keyed by the database data version, which every committed write bumps, so a new
+# version (from any write path, including background refresh workers) misses and reloads.
+
+
+@lru_cache(maxsize=1)
+def _cached_ticker_price_table(_data_version: int) -> pd.DataFrame:
+    return PortfolioService.get_ticker_price_table()
+
+
+@lru_cache(maxsize=1)
+def _cached_unique_tickers(_data_version: int) -> tuple[str, ...]:
+    return tuple(PortfolioService.get_unique_tickers())
+
+
+@lru_cache(maxsize=1)
+def _cached_tickers_with_info(_data_version: int) -> tuple[dict, ...]:
+    return tuple(PortfolioService.get_tickers_with_info())
 
 
 def get_ticker_price_table() -> pd.DataFrame:
     """Generate a table with tickers for price entry, auto-filled from price data."""
-    return PortfolioService.get_ticker_price_table()
+    return _cached_ticker_price_table(get_data_version()).copy()
 
 
 def get_unique_tickers() -> list[str]:
     """Get list of unique tickers in portfolio."""
-    return PortfolioService.get_unique_tickers()
+    return list(_cached_unique_tickers(get_data_version()))
+
+
+def get_tickers_with_info() -> list[dict]:
+    """Get unique tickers with their asset type and currency info."""
+    return [dict(info) for info in _cached_tickers_with_info(get_data_version())]
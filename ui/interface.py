@@ -4,10 +4,10 @@ LiraShield - Gradio UI Interface
 Creates the Gradio blocks UI for portfolio tracking with inflation adjustment.
 """
 
+import asyncio
 from datetime import datetime
 
 import gradio as gr
-import pandas as pd
 
 from ui.handlers import (
     # Transaction handlers
@@ -41,33 +41,315 @@ from ui.handlers import (
     handle_long_check_us_stocks,
     handle_quick_check_tefas,
     handle_long_check_tefas,
+    handle_refresh_all_quick,
+    # Pagination
+    DEFAULT_PAGE_SIZE,
+    TABLE_CSS,
+    html_table,
+    with_pagination,
 )
 
 
+# Price refreshes share one slot instead of hitting yfinance/TEFAS in parallel; a quick check
+# queued behind another finds the prices already stored and returns without downloading them again
+_PRICE_REFRESH_QUEUE = {"concurrency_id": "price_refresh", "concurrency_limit": 1}
+
+# Static page text (gr.Markdown dedents and strips it when rendering)
+
+_MD_HEADER = """
+# LiraShield
+
+**Track your portfolio returns adjusted for inflation using USD/TRY as the benchmark.**
+
+*If USD rose 20% and your stock rose 20%, your real gain is 0%.*
+"""
+
+_MD_TX_HELP = """
+### Add Transactions (Buy / Sell)
+*Prices are automatically fetched based on asset type: TEFAS for Turkish funds, yfinance for US stocks.*
+*You can also manually enter the buy price - leave empty to auto-fetch.*
+*Sells use FIFO (First In, First Out) to match with oldest buy lots for cost basis calculation.*
+"""
+
+_MD_DATA_HEADER = """
+### Manage CPI, USD Rates, US Stocks, and TEFAS Stocks Data
+
+View and manage all your data sources in one place.
+"""
+
+_MD_CPI_INTRO = """
+**Official CPI Data from Turkish Central Bank (TCMB)**
+
+**YoY** = Year-over-Year inflation rate (e.g., 44.38% for Dec 2024)  
+**MoM** = Month-over-Month change (e.g., 1.03% for Dec 2024)
+"""
+
+_MD_CPI_BULK_HINT = """
+Paste CSV data from TCMB in format: `month,yoy,mom` (one per line)
+
+Supports both `MM-YYYY` and `YYYY-MM` formats.
+"""
+
+_MD_CPI_CSV_HELP = """
+**Import CPI data from CSV**
+
+Paste CSV data from TCMB in format: `month,yoy,mom` (one per line)
+Supports both `MM-YYYY` and `YYYY-MM` formats.
+"""
+
+_MD_USD_INTRO = """
+**USD/TRY Exchange Rates (Inflation Proxy)**
+
+The "street method" uses USD/TRY exchange rate changes as an inflation proxy.
+"""
+
+_MD_USD_API_HELP = """
+**Refresh USD/TRY exchange rates from yfinance**
+
+- **Quick Check**: Updates from latest stored date to today
+- **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
+"""
+
+_MD_USD_BULK_HINT = """
+Paste CSV data in format: `date,rate` (one per line)
+
+Example:
+```
+2024-01-01,29.5
+2024-02-01,30.2
+```
+"""
+
+_MD_US_STOCKS_INTRO = """
+**US Stock Prices**
+
+Manage and refresh US stock price data from yfinance.
+"""
+
+_MD_US_STOCKS_API_HELP = """
+**Refresh US stock prices from yfinance**
+
+Updates prices for all US stocks in your portfolio.
+- **Quick Check**: Updates from latest stored date to today
+- **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
+"""
+
+_MD_TEFAS_INTRO = """
+**TEFAS Fund Prices**
+
+Manage and refresh TEFAS fund price data from crawler.
+"""
+
+_MD_TEFAS_API_HELP = """
+**Refresh TEFAS fund prices from crawler**
+
+Updates prices for all TEFAS funds in your portfolio.
+- **Quick Check**: Updates from latest stored date to today
+- **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
+"""
+
+_MD_ANALYSIS_HELP = """
+### Calculate Real Returns
+
+Enter current prices for your assets to see inflation-adjusted gains.
+
+**Formula:** Real Return = ((1 + Nominal Return) / (1 + Inflation)) - 1
+"""
+
+_MD_ANALYSIS_LEGEND = """
+---
+**Legend:**
+- 📈 **OPEN** = Unsold position (unrealized gains)
+- ✅ **SOLD** = Closed position (realized gains via FIFO)
+- 🟢 Positive real return (beat inflation)
+- 🔴 Negative real return (inflation won)
+- **Tax** = Tax rate on TRY gains at sell
+- **Nominal** = After-tax nominal return
+- **Unreal P/L** = Unrealized Profit/Loss (open positions)
+- **Realized** = Realized Profit/Loss from sales (FIFO)
+- **Real (USD)** = Weighted average real return vs USD (after tax)
+- **Real (CPI)** = Weighted average real return vs official CPI (after tax)
+
+**FIFO (First In, First Out):** When you sell, the oldest buy lots are matched first.
+"""
+
+_MD_CHARTS_HELP = """
+### View Fund Price History
+
+View fund prices in both **TRY** and **USD** terms to understand real performance.
+
+*USD conversion uses rates from the database. Fetch rates in the USD Rates tab first.*
+"""
+
+_MD_COMPARE_HELP = """
+#### Compare multiple funds on a normalized scale
+
+All funds are normalized to **100** at the base date for fair comparison.
+This shows relative performance regardless of share price.
+"""
+
+_MD_CHARTS_LEGEND = """
+---
+**Understanding the Charts:**
+
+- **TRY Price**: Nominal price in Turkish Lira (what you see on TEFAS)
+- **USD Price**: Price converted to USD using historical exchange rates
+- **Normalized (100)**: All funds start at 100 for easy comparison
+
+*A fund that goes from 100 → 120 gained 20%, while one that goes 100 → 80 lost 20%.*
+"""
+
+_MD_HELP = """
+## How to Use This App
+
+### Step 1: Add Your Transactions
+1. Go to the **📊 Transactions** tab
+2. Select **Buy** or **Sell** transaction type
+3. Enter the date, TEFAS fund code (e.g., MAC, TI2), and quantity
+4. **Prices are automatically fetched from TEFAS** - no manual entry needed!
+5. Optionally set the **Tax Rate** (% of TRY gains taxed at sell)
+6. Click "Save Transaction"
+
+**Sell Transactions:**
+- When selling, the system validates you have enough shares
+- FIFO (First In, First Out) is used to match sells to buys
+- The oldest lots are sold first, just like real brokerage accounts
+
+### Step 2: Refresh USD/TRY Rates
+1. Go to the **💵 USD Rates** tab
+2. Click **"Refresh All USD Rates"** - this fetches all historical rates from Yahoo Finance
+3. The system automatically determines the date range needed based on your transactions
+4. All rates are stored in the database for offline use
+
+### Step 3: Analyze
+1. Go to the **📈 Analyze Returns** tab
+2. Current prices are **auto-filled from TEFAS** data
+3. Click "Update TEFAS Prices" to refresh latest prices
+4. Click "Calculate Real Gains"
+
+---
+
+## TEFAS Integration
+
+This app automatically fetches fund prices from [TEFAS](https://www.tefas.gov.tr/):
+- **Buy prices** are looked up based on transaction date
+- **Current prices** are auto-filled in the analysis tab
+- Historical data up to 5 years is fetched for new funds
+
+**Supported funds:** All funds listed on TEFAS (mutual funds, pension funds, ETFs)
+
+---
+
+## USD/TRY Rate Management
+
+All USD/TRY rates are stored in the local database:
+- Click **"Refresh All USD Rates"** to fetch all rates from your earliest transaction to today
+- Rates are fetched from Yahoo Finance (USDTRY=X ticker)
+- Once fetched, rates are stored locally and used for all calculations
+- Charts and analysis use the database rates (no external calls during analysis)
+
+---
+
+## Understanding Real Returns
+
+**Nominal Return:** How much your investment went up/down in TRY terms (after tax).
+
+**USD Change:** How much TRY lost value against USD.
+
+**Real Return:** Your actual purchasing power gain/loss (after tax).
+
+### Tax Calculation
+
+Tax is applied only on **TRY gains** (not losses):
+- After-tax value = Current Price - (Gain × Tax Rate)
+- Example: Buy at 0.50, now 0.75, tax 10% → Tax = 0.25 × 10% = 0.025 TRY → After-tax = 0.725 TRY
+
+---
+
+## FIFO Cost Basis Method
+
+**FIFO (First In, First Out)** is the standard cost basis method used by Turkish and most international brokerages.
+
+**How it works:**
+1. When you **buy** shares, each purchase becomes a "lot" with its own cost basis
+2. When you **sell** shares, the **oldest lots are matched first**
+3. Realized gains/losses are calculated based on the matched lot's original buy price
+
+**Example:**
+- Buy 100 shares @ 10 TRY (Lot 1)
+- Buy 50 shares @ 15 TRY (Lot 2)
+- Sell 120 shares @ 20 TRY
+  - FIFO matches: 100 from Lot 1 + 20 from Lot 2
+  - Realized gain: (100 × 10) + (20 × 5) = 1,100 TRY
+  - Remaining: 30 shares from Lot 2 @ 15 TRY
+
+**Benefits:**
+- Accurate cost basis tracking for tax reporting
+- Separate unrealized (open) and realized (closed) gains
+- Matches how your broker calculates gains
+
+---
+
+## What is a Benchmark?
+
+In finance, a **Benchmark** (Karşılaştırma Ölçütü) is a standard or reference point used to evaluate the performance of a security, mutual fund, or investment manager.
+
+**Function:** It serves as a yardstick to determine if an investment is performing better or worse than the general market.
+
+**Common Examples:**
+- **S&P 500** - for US stocks
+- **BIST 100** - for Turkish stocks
+- **USD/TRY** - for Turkish inflation (the "street method")
+- **Official CPI** - for measuring against TCMB inflation data
+
+If a fund's benchmark is BIST 100, the fund manager aims to generate returns higher than that index. 
+
+**In LiraShield**, we use **USD/TRY** and **Official CPI** as benchmarks to measure your *real* purchasing power gains — because beating nominal inflation is what truly matters.
+
+---
+
+## Data Sources
+
+- **Fund Prices**: [TEFAS](https://www.tefas.gov.tr/) (automatic)
+- **CPI**: [TCMB Consumer Prices](https://www.tcmb.gov.tr/wps/wcm/connect/EN/TCMB+EN/Main+Menu/Statistics/Inflation+Data/Consumer+Prices)
+- **USD/TRY**: Yahoo Finance (USDTRY=X ticker) - stored in local database
+
+The app stores all data in a local SQLite database (`portfolio.db`).
+"""
+
+
 def create_ui() -> gr.Blocks:
     """Create the Gradio UI."""
+    # pandas is only needed while building the UI (empty table placeholders, local handler annotations)
+    import pandas as pd
+
+    def refresh_section(label: str, help_md: str, table_label: str | None = None) -> tuple[gr.Button, gr.Button, gr.Textbox, gr.Dataframe | None]:
+        """
+        Build a collapsed "Refresh - API Check" accordion.
+
+        Args:
+            label: Source name shown on the Quick/Long Check buttons
+            help_md: Markdown shown above the buttons
+            table_label: If given, a per-ticker status table is added below the status box
+
+        Returns:
+            Tuple of (quick check button, long check button, status textbox, status table or None)
+        """
+        with gr.Accordion("🔄 Refresh - API Check", open=False):
+            gr.Markdown(help_md)
+            with gr.Row():
+                btn_quick = gr.Button(f"⚡ Quick Check {label}", variant="primary", size="lg")
+                btn_long = gr.Button(f"🔄 Long Check {label}", variant="secondary", size="lg")
+            status = gr.Textbox(label="Status", interactive=False, lines=4)
+            table = gr.Dataframe(value=pd.DataFrame(), label=table_label, interactive=False) if table_label else None
+        return btn_quick, btn_long, status, table
 
     with gr.Blocks(title="LiraShield") as demo:
-        gr.Markdown(
-            """
-            # LiraShield
-            
-            **Track your portfolio returns adjusted for inflation using USD/TRY as the benchmark.**
-            
-            *If USD rose 20% and your stock rose 20%, your real gain is 0%.*
-            """,
-        )
+        gr.Markdown(_MD_HEADER)
 
         # ============== TAB 1: TRANSACTIONS ==============
         with gr.Tab("📊 Transactions"):
-            gr.Markdown(
-                """
-                ### Add Transactions (Buy / Sell)
-                *Prices are automatically fetched based on asset type: TEFAS for Turkish funds, yfinance for US stocks.*
-                *You can also manually enter the buy price - leave empty to auto-fetch.*
-                *Sells use FIFO (First In, First Out) to match with oldest buy lots for cost basis calculation.*
-                """
-            )
+            gr.Markdown(_MD_TX_HELP)
 
             with gr.Row():
                 with gr.Column(scale=2):
@@ -103,14 +385,16 @@ def create_ui() -> gr.Blocks:
                 btn_refresh_tx = gr.Button("🔄", variant="secondary", size="sm", scale=0, min_width=40)
             with gr.Row():
                 tx_filter_ticker = gr.Dropdown(
-                    choices=["All"] + get_unique_tickers(),
+                    choices=["All"],
                     value="All",
                     label="Filter by Ticker",
                     info="Select a ticker to filter transactions",
                     interactive=True,
                 )
+                tx_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=0, min_width=100)
+                tx_page_size = gr.Number(label="Rows per page", value=DEFAULT_PAGE_SIZE, minimum=1, precision=0, scale=0, min_width=120)
             tx_table = gr.Dataframe(
-                value=refresh_portfolio(),
+                value=pd.DataFrame(),
                 label="Portfolio Transactions",
                 interactive=False,
             )
@@ -127,37 +411,50 @@ def create_ui() -> gr.Blocks:
                     return refresh_portfolio()
                 return refresh_portfolio(ticker_filter)
 
+            # Only the selected page of the table is sent to the browser
+            tx_paging = [tx_page, tx_page_size]
+            paged_filter_portfolio = with_pagination(filter_portfolio)
+
+            def refresh_tx_view(ticker_filter: str) -> tuple[dict, pd.DataFrame]:
+                """Reload ticker choices and the filtered table in one event."""
+                return update_ticker_choices(), filter_portfolio(ticker_filter)
+
+            paged_refresh_tx_view = with_pagination(refresh_tx_view)
+
+            def status_only(handler):
+                """Keep only the status of a (status, table) handler; the filtered table is sent by refresh_tx_view."""
+
+                def wrapper(*args) -> str:
+                    return handler(*args)[0]
+
+                wrapper.__name__ = handler.__name__
+                return wrapper
+
             # Transaction event handlers
-            btn_add_tx.click(handle_add_transaction, inputs=[tx_date, tx_ticker, tx_qty, tx_tax, tx_notes, tx_asset_type, tx_type, tx_buy_price], outputs=[tx_status, tx_table]).then(
-                update_ticker_choices, outputs=[tx_filter_ticker]
-            ).then(filter_portfolio, inputs=[tx_filter_ticker], outputs=[tx_table])
-            btn_del_tx.click(handle_delete_transaction, inputs=[del_tx_id], outputs=[tx_status, tx_table]).then(update_ticker_choices, outputs=[tx_filter_ticker]).then(
-                filter_portfolio, inputs=[tx_filter_ticker], outputs=[tx_table]
+            btn_add_tx.click(
+                status_only(handle_add_transaction), inputs=[tx_date, tx_ticker, tx_qty, tx_tax, tx_notes, tx_asset_type, tx_type, tx_buy_price], outputs=[tx_status]
+            ).then(paged_refresh_tx_view, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_filter_ticker, tx_table])
+            btn_del_tx.click(status_only(handle_delete_transaction), inputs=[del_tx_id], outputs=[tx_status]).then(
+                paged_refresh_tx_view, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_filter_ticker, tx_table]
             )
-            btn_refresh_tx.click(update_ticker_choices, outputs=[tx_filter_ticker]).then(filter_portfolio, inputs=[tx_filter_ticker], outputs=[tx_table])
 
-            tx_filter_ticker.change(filter_portfolio, inputs=[tx_filter_ticker], outputs=[tx_table])
+            # A single event (rather than .click().then()) keeps the button locked for the whole refresh,
+            # so repeated clicks while it is pending are dropped instead of queueing more table reads
+            btn_refresh_tx.click(paged_refresh_tx_view, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_filter_ticker, tx_table], trigger_mode="once")
+
+            tx_filter_ticker.change(paged_filter_portfolio, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_table])
+            tx_page.change(paged_filter_portfolio, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_table])
+            tx_page_size.change(paged_filter_portfolio, inputs=[tx_filter_ticker, *tx_paging], outputs=[tx_table])
 
         # ============== TAB 2: DATA MANAGEMENT ==============
         with gr.Tab("📊 Data Management"):
-            gr.Markdown(
-                """
-                ### Manage CPI, USD Rates, US Stocks, and TEFAS Stocks Data
-                
-                View and manage all your data sources in one place.
-                """
-            )
+            gr.Markdown(_MD_DATA_HEADER)
+
+            btn_refresh_all = gr.Button("🚀 Refresh All Sources", variant="primary", size="lg")
 
             # CPI Section
             with gr.Accordion("📊 CPI (TCMB)", open=True):
-                gr.Markdown(
-                    """
-                    **Official CPI Data from Turkish Central Bank (TCMB)**
-                    
-                    **YoY** = Year-over-Year inflation rate (e.g., 44.38% for Dec 2024)  
-                    **MoM** = Month-over-Month change (e.g., 1.03% for Dec 2024)
-                    """
-                )
+                gr.Markdown(_MD_CPI_INTRO)
 
                 with gr.Row():
                     with gr.Column(scale=2):
@@ -179,55 +476,40 @@ def create_ui() -> gr.Blocks:
                 cpi_status = gr.Textbox(label="Status", interactive=False)
 
                 with gr.Accordion("📥 Bulk Import CPI Data (CSV)", open=False):
-                    gr.Markdown(
-                        """
-                        Paste CSV data from TCMB in format: `month,yoy,mom` (one per line)
-                        
-                        Supports both `MM-YYYY` and `YYYY-MM` formats.
-                        """
-                    )
+                    gr.Markdown(_MD_CPI_BULK_HINT)
                     bulk_cpi_csv = gr.Textbox(label="CSV Data", placeholder="12-2024,44.38,1.03\n11-2024,47.09,2.24", lines=5)
                     btn_bulk_import_cpi = gr.Button("📥 Import All", variant="primary")
 
                 with gr.Accordion("🔄 Refresh - CSV Import", open=False):
-                    gr.Markdown(
-                        """
-                        **Import CPI data from CSV**
-                        
-                        Paste CSV data from TCMB in format: `month,yoy,mom` (one per line)
-                        Supports both `MM-YYYY` and `YYYY-MM` formats.
-                        """
-                    )
+                    gr.Markdown(_MD_CPI_CSV_HELP)
                     refresh_cpi_csv = gr.Textbox(label="CSV Data", placeholder="12-2024,44.38,1.03\n11-2024,47.09,2.24", lines=5)
                     btn_refresh_cpi_csv = gr.Button("📥 Import CPI CSV", variant="primary")
                     refresh_cpi_status = gr.Textbox(label="Status", interactive=False, lines=3)
 
                 gr.Markdown("### Stored CPI Data")
-                cpi_table = gr.Dataframe(
-                    value=refresh_cpi(),
-                    label="Official CPI Data (TCMB)",
-                    interactive=False,
-                )
+                with gr.Row():
+                    cpi_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=0, min_width=100)
+                    cpi_page_size = gr.Number(label="Rows per page", value=DEFAULT_PAGE_SIZE, minimum=1, precision=0, scale=0, min_width=120)
+                cpi_table = gr.HTML(value="", label="Official CPI Data (TCMB)", show_label=True, container=True, css_template=TABLE_CSS, max_height=600)
                 btn_refresh_cpi = gr.Button("🔄 Refresh Table")
 
+                cpi_paging = [cpi_page, cpi_page_size]
+                paged_refresh_cpi = with_pagination(refresh_cpi, render=html_table)
+
                 # CPI event handlers
-                btn_add_cpi.click(handle_add_cpi, inputs=[cpi_month, cpi_yoy, cpi_mom, cpi_notes], outputs=[cpi_status, cpi_table])
-                btn_del_cpi.click(handle_delete_cpi, inputs=[del_cpi_id], outputs=[cpi_status, cpi_table])
-                btn_bulk_import_cpi.click(handle_bulk_import_cpi, inputs=[bulk_cpi_csv], outputs=[cpi_status, cpi_table])
-                btn_refresh_cpi_csv.click(handle_refresh_cpi_csv, inputs=[refresh_cpi_csv], outputs=[refresh_cpi_status, cpi_table])
-                btn_refresh_cpi.click(refresh_cpi, outputs=[cpi_table])
+                btn_add_cpi.click(with_pagination(handle_add_cpi, render=html_table), inputs=[cpi_month, cpi_yoy, cpi_mom, cpi_notes, *cpi_paging], outputs=[cpi_status, cpi_table])
+                btn_del_cpi.click(with_pagination(handle_delete_cpi, render=html_table), inputs=[del_cpi_id, *cpi_paging], outputs=[cpi_status, cpi_table])
+                btn_bulk_import_cpi.click(with_pagination(handle_bulk_import_cpi, render=html_table), inputs=[bulk_cpi_csv, *cpi_paging], outputs=[cpi_status, cpi_table])
+                btn_refresh_cpi_csv.click(with_pagination(handle_refresh_cpi_csv, render=html_table), inputs=[refresh_cpi_csv, *cpi_paging], outputs=[refresh_cpi_status, cpi_table])
+                btn_refresh_cpi.click(paged_refresh_cpi, inputs=cpi_paging, outputs=[cpi_table], trigger_mode="once")
+                cpi_page.change(paged_refresh_cpi, inputs=cpi_paging, outputs=[cpi_table])
+                cpi_page_size.change(paged_refresh_cpi, inputs=cpi_paging, outputs=[cpi_table])
 
             gr.Markdown("---")
 
             # USD Rates Section
             with gr.Accordion("💵 USD/TRY Rates", open=True):
-                gr.Markdown(
-                    """
-                    **USD/TRY Exchange Rates (Inflation Proxy)**
-                    
-                    The "street method" uses USD/TRY exchange rate changes as an inflation proxy.
-                    """
-                )
+                gr.Markdown(_MD_USD_INTRO)
 
                 with gr.Row():
                     with gr.Column(scale=2):
@@ -255,26 +537,13 @@ def create_ui() -> gr.Blocks:
 
                 rate_status = gr.Textbox(label="Status", interactive=False, lines=4)
 
-                with gr.Accordion("🔄 Refresh - API Check", open=False):
-                    gr.Markdown(
-                        """
-                        **Refresh USD/TRY exchange rates from yfinance**
-                        
-                        - **Quick Check**: Updates from latest stored date to today
-                        - **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
-                        """
-                    )
-                    with gr.Row():
-                        btn_quick_check_usdtry = gr.Button("⚡ Quick Check USDTRY", variant="primary", size="lg")
-                        btn_long_check_usdtry = gr.Button("🔄 Long Check USDTRY", variant="secondary", size="lg")
-                    usdtry_status = gr.Textbox(label="Status", interactive=False, lines=4)
+                btn_quick_check_usdtry, btn_long_check_usdtry, usdtry_status, _ = refresh_section("USDTRY", _MD_USD_API_HELP)
 
                 gr.Markdown("### Stored USD/TRY Rates")
-                rate_table = gr.Dataframe(
-                    value=refresh_rates(),
-                    label="USD/TRY Rates (from Yahoo Finance)",
-                    interactive=False,
-                )
+                with gr.Row():
+                    rate_page = gr.Number(label="Page", value=1, minimum=1, precision=0, scale=0, min_width=100)
+                    rate_page_size = gr.Number(label="Rows per page", value=DEFAULT_PAGE_SIZE, minimum=1, precision=0, scale=0, min_width=120)
+                rate_table = gr.HTML(value="", label="USD/TRY Rates (from Yahoo Finance)", show_label=True, container=True, css_template=TABLE_CSS, max_height=600)
 
                 with gr.Accordion("📥 Manual Entry (Advanced)", open=False):
                     gr.Markdown("*Use this only if you need to add rates manually for dates not covered by Yahoo Finance.*")
@@ -287,112 +556,71 @@ def create_ui() -> gr.Blocks:
                         btn_fetch_rate = gr.Button("🌐 Fetch Single Date", variant="secondary")
 
                 with gr.Accordion("📥 Bulk Import (CSV)", open=False):
-                    gr.Markdown(
-                        """
-                        Paste CSV data in format: `date,rate` (one per line)
-                        
-                        Example:
-                        ```
-                        2024-01-01,29.5
-                        2024-02-01,30.2
-                        ```
-                        """
-                    )
+                    gr.Markdown(_MD_USD_BULK_HINT)
                     bulk_csv = gr.Textbox(label="CSV Data", placeholder="2024-01-01,29.5\n2024-02-01,30.2", lines=3)
                     btn_bulk_import = gr.Button("📥 Import", variant="secondary")
 
+                def keep_rates_if_unchanged(check):
+                    """Wrap a USDTRY check so a None table becomes gr.update() and the displayed table is not re-sent."""
+
+                    def wrapper() -> tuple[str, pd.DataFrame | dict]:
+                        status, rates = check()
+                        return status, gr.update() if rates is None else rates
+
+                    wrapper.__name__ = check.__name__
+                    return wrapper
+
+                rate_paging = [rate_page, rate_page_size]
+                paged_refresh_rates = with_pagination(refresh_rates, render=html_table)
+
                 # Rate event handlers
-                btn_quick_refresh_usd.click(handle_quick_refresh_usd_rates, outputs=[rate_status, rate_table])
-                btn_refresh_all_usd.click(handle_refresh_all_usd_rates, outputs=[rate_status, rate_table])
-                btn_quick_check_usdtry.click(handle_quick_check_usdtry, outputs=[usdtry_status, rate_table])
-                btn_long_check_usdtry.click(handle_long_check_usdtry, outputs=[usdtry_status, rate_table])
-                btn_add_rate.click(handle_add_rate, inputs=[rate_date, rate_value, rate_notes], outputs=[rate_status, rate_table])
-                btn_fetch_rate.click(handle_fetch_rate, inputs=[rate_date], outputs=[rate_status, rate_table])
-                btn_del_rate.click(handle_delete_rate, inputs=[del_rate_id], outputs=[rate_status, rate_table])
-                btn_bulk_import.click(handle_bulk_import, inputs=[bulk_csv], outputs=[rate_status, rate_table])
+                btn_quick_refresh_usd.click(with_pagination(handle_quick_refresh_usd_rates, render=html_table), inputs=rate_paging, outputs=[rate_status, rate_table])
+                btn_refresh_all_usd.click(with_pagination(handle_refresh_all_usd_rates, render=html_table), inputs=rate_paging, outputs=[rate_status, rate_table])
+                btn_quick_check_usdtry.click(with_pagination(keep_rates_if_unchanged(handle_quick_check_usdtry), render=html_table), inputs=rate_paging, outputs=[usdtry_status, rate_table])
+                btn_long_check_usdtry.click(with_pagination(keep_rates_if_unchanged(handle_long_check_usdtry), render=html_table), inputs=rate_paging, outputs=[usdtry_status, rate_table])
+                btn_add_rate.click(with_pagination(handle_add_rate, render=html_table), inputs=[rate_date, rate_value, rate_notes, *rate_paging], outputs=[rate_status, rate_table])
+                btn_fetch_rate.click(with_pagination(handle_fetch_rate, render=html_table), inputs=[rate_date, *rate_paging], outputs=[rate_status, rate_table])
+                btn_del_rate.click(with_pagination(handle_delete_rate, render=html_table), inputs=[del_rate_id, *rate_paging], outputs=[rate_status, rate_table])
+                btn_bulk_import.click(with_pagination(handle_bulk_import, render=html_table), inputs=[bulk_csv, *rate_paging], outputs=[rate_status, rate_table])
+                rate_page.change(paged_refresh_rates, inputs=rate_paging, outputs=[rate_table])
+                rate_page_size.change(paged_refresh_rates, inputs=rate_paging, outputs=[rate_table])
 
             # US Stocks Section
             with gr.Accordion("📈 US Stocks", open=True):
-                gr.Markdown(
-                    """
-                    **US Stock Prices**
-                    
-                    Manage and refresh US stock price data from yfinance.
-                    """
-                )
+                gr.Markdown(_MD_US_STOCKS_INTRO)
 
-                with gr.Accordion("🔄 Refresh - API Check", open=False):
-                    gr.Markdown(
-                        """
-                        **Refresh US stock prices from yfinance**
-                        
-                        Updates prices for all US stocks in your portfolio.
-                        - **Quick Check**: Updates from latest stored date to today
-                        - **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
-                        """
-                    )
-                    with gr.Row():
-                        btn_quick_check_us_stocks = gr.Button("⚡ Quick Check US Stocks", variant="primary", size="lg")
-                        btn_long_check_us_stocks = gr.Button("🔄 Long Check US Stocks", variant="secondary", size="lg")
-                    us_stocks_status = gr.Textbox(label="Status", interactive=False, lines=4)
-                    us_stocks_table = gr.Dataframe(
-                        value=pd.DataFrame(),
-                        label="US Stocks Status",
-                        interactive=False,
-                    )
-                    btn_quick_check_us_stocks.click(handle_quick_check_us_stocks, outputs=[us_stocks_status, us_stocks_table])
-                    btn_long_check_us_stocks.click(handle_long_check_us_stocks, outputs=[us_stocks_status, us_stocks_table])
+                btn_quick_check_us_stocks, btn_long_check_us_stocks, us_stocks_status, us_stocks_table = refresh_section(
+                    "US Stocks", _MD_US_STOCKS_API_HELP, table_label="US Stocks Status"
+                )
+                btn_quick_check_us_stocks.click(handle_quick_check_us_stocks, outputs=[us_stocks_status, us_stocks_table], **_PRICE_REFRESH_QUEUE)
+                btn_long_check_us_stocks.click(handle_long_check_us_stocks, outputs=[us_stocks_status, us_stocks_table], **_PRICE_REFRESH_QUEUE)
 
             gr.Markdown("---")
 
             # TEFAS Stocks Section
             with gr.Accordion("🏦 TEFAS Stocks", open=True):
-                gr.Markdown(
-                    """
-                    **TEFAS Fund Prices**
-                    
-                    Manage and refresh TEFAS fund price data from crawler.
-                    """
-                )
-
-                with gr.Accordion("🔄 Refresh - API Check", open=False):
-                    gr.Markdown(
-                        """
-                        **Refresh TEFAS fund prices from crawler**
-                        
-                        Updates prices for all TEFAS funds in your portfolio.
-                        - **Quick Check**: Updates from latest stored date to today
-                        - **Long Check**: Ensures 5 years of history (fetches 5 years if no entry exists)
-                        """
-                    )
-                    with gr.Row():
-                        btn_quick_check_tefas = gr.Button("⚡ Quick Check TEFAS", variant="primary", size="lg")
-                        btn_long_check_tefas = gr.Button("🔄 Long Check TEFAS", variant="secondary", size="lg")
-                    tefas_status = gr.Textbox(label="Status", interactive=False, lines=4)
-                    tefas_table = gr.Dataframe(
-                        value=pd.DataFrame(),
-                        label="TEFAS Stocks Status",
-                        interactive=False,
-                    )
-                    btn_quick_check_tefas.click(handle_quick_check_tefas, outputs=[tefas_status, tefas_table])
-                    btn_long_check_tefas.click(handle_long_check_tefas, outputs=[tefas_status, tefas_table])
+                gr.Markdown(_MD_TEFAS_INTRO)
+
+                btn_quick_check_tefas, btn_long_check_tefas, tefas_status, tefas_table = refresh_section("TEFAS", _MD_TEFAS_API_HELP, table_label="TEFAS Stocks Status")
+                btn_quick_check_tefas.click(handle_quick_check_tefas, outputs=[tefas_status, tefas_table], **_PRICE_REFRESH_QUEUE)
+                btn_long_check_tefas.click(handle_long_check_tefas, outputs=[tefas_status, tefas_table], **_PRICE_REFRESH_QUEUE)
+
+            # USD/TRY, US stocks and TEFAS quick refreshes run in parallel
+            btn_refresh_all.click(
+                with_pagination(handle_refresh_all_quick, render=html_table),
+                inputs=rate_paging,
+                outputs=[rate_status, us_stocks_status, tefas_status, us_stocks_table, tefas_table, rate_table],
+                **_PRICE_REFRESH_QUEUE,
+            )
 
         # ============== TAB 3: ANALYSIS ==============
         with gr.Tab("📈 Analyze Returns") as analysis_tab:
-            gr.Markdown(
-                """
-                ### Calculate Real Returns
-                
-                Enter current prices for your assets to see inflation-adjusted gains.
-                
-                **Formula:** Real Return = ((1 + Nominal Return) / (1 + Inflation)) - 1
-                """
-            )
+            gr.Markdown(_MD_ANALYSIS_HELP)
 
             gr.Markdown("#### Current Prices")
 
             price_table = gr.Dataframe(
-                value=get_ticker_price_table(),
+                value=pd.DataFrame(),
                 label="Enter current prices for each ticker (auto-filled from price data)",
                 interactive=True,
                 column_count=(3, "fixed"),
@@ -414,24 +642,7 @@ def create_ui() -> gr.Blocks:
                 interactive=False,
             )
 
-            gr.Markdown(
-                """
-                ---
-                **Legend:**
-                - 📈 **OPEN** = Unsold position (unrealized gains)
-                - ✅ **SOLD** = Closed position (realized gains via FIFO)
-                - 🟢 Positive real return (beat inflation)
-                - 🔴 Negative real return (inflation won)
-                - **Tax** = Tax rate on TRY gains at sell
-                - **Nominal** = After-tax nominal return
-                - **Unreal P/L** = Unrealized Profit/Loss (open positions)
-                - **Realized** = Realized Profit/Loss from sales (FIFO)
-                - **Real (USD)** = Weighted average real return vs USD (after tax)
-                - **Real (CPI)** = Weighted average real return vs official CPI (after tax)
-                
-                **FIFO (First In, First Out):** When you sell, the oldest buy lots are matched first.
-                """
-            )
+            gr.Markdown(_MD_ANALYSIS_LEGEND)
 
             # Analysis event handlers
             btn_calc.click(analyze_portfolio, inputs=[price_table], outputs=[out_table, summary_table, calc_status])
@@ -441,24 +652,16 @@ def create_ui() -> gr.Blocks:
 
         # ============== TAB 4: FUND CHARTS ==============
         with gr.Tab("📉 Fund Charts"):
-            gr.Markdown(
-                """
-                ### View Fund Price History
-                
-                View fund prices in both **TRY** and **USD** terms to understand real performance.
-                
-                *USD conversion uses rates from the database. Fetch rates in the USD Rates tab first.*
-                """
-            )
+            gr.Markdown(_MD_CHARTS_HELP)
 
             with gr.Accordion("📈 Single Fund Chart", open=True):
                 gr.Markdown("#### View a single fund's price history in TRY and USD")
 
                 with gr.Row():
                     chart_ticker = gr.Dropdown(
-                        choices=get_unique_tickers() or ["No tickers"],
+                        choices=["No tickers"],
                         label="Select Fund",
-                        value=get_unique_tickers()[0] if get_unique_tickers() else None,
+                        value=None,
                         interactive=True,
                     )
                     chart_base_date = gr.DateTime(
@@ -476,20 +679,13 @@ def create_ui() -> gr.Blocks:
                 btn_generate_chart.click(generate_fund_chart, inputs=[chart_ticker, chart_base_date], outputs=[single_chart, chart_status])
 
             with gr.Accordion("📊 Compare Multiple Funds", open=False):
-                gr.Markdown(
-                    """
-                    #### Compare multiple funds on a normalized scale
-                    
-                    All funds are normalized to **100** at the base date for fair comparison.
-                    This shows relative performance regardless of share price.
-                    """
-                )
+                gr.Markdown(_MD_COMPARE_HELP)
 
                 with gr.Row():
                     compare_tickers = gr.Textbox(
                         label="Tickers (comma-separated)",
                         placeholder="MAC, TI2, AFT",
-                        value=", ".join(get_unique_tickers()[:3]) if get_unique_tickers() else "",
+                        value="",
                     )
                     compare_base_date = gr.DateTime(
                         label="Base Date (optional)",
@@ -506,139 +702,43 @@ def create_ui() -> gr.Blocks:
 
                 btn_compare.click(generate_normalized_chart, inputs=[compare_tickers, compare_show_usd, compare_base_date], outputs=[compare_chart, compare_status])
 
-            gr.Markdown(
-                """
-                ---
-                **Understanding the Charts:**
-                
-                - **TRY Price**: Nominal price in Turkish Lira (what you see on TEFAS)
-                - **USD Price**: Price converted to USD using historical exchange rates
-                - **Normalized (100)**: All funds start at 100 for easy comparison
-                
-                *A fund that goes from 100 → 120 gained 20%, while one that goes 100 → 80 lost 20%.*
-                """
-            )
+            gr.Markdown(_MD_CHARTS_LEGEND)
 
         # ============== TAB 5: HELP ==============
         with gr.Tab("❓ Help"):
-            gr.Markdown(
-                """
-                ## How to Use This App
-                
-                ### Step 1: Add Your Transactions
-                1. Go to the **📊 Transactions** tab
-                2. Select **Buy** or **Sell** transaction type
-                3. Enter the date, TEFAS fund code (e.g., MAC, TI2), and quantity
-                4. **Prices are automatically fetched from TEFAS** - no manual entry needed!
-                5. Optionally set the **Tax Rate** (% of TRY gains taxed at sell)
-                6. Click "Save Transaction"
-                
-                **Sell Transactions:**
-                - When selling, the system validates you have enough shares
-                - FIFO (First In, First Out) is used to match sells to buys
-                - The oldest lots are sold first, just like real brokerage accounts
-                
-                ### Step 2: Refresh USD/TRY Rates
-                1. Go to the **💵 USD Rates** tab
-                2. Click **"Refresh All USD Rates"** - this fetches all historical rates from Yahoo Finance
-                3. The system automatically determines the date range needed based on your transactions
-                4. All rates are stored in the database for offline use
-                
-                ### Step 3: Analyze
-                1. Go to the **📈 Analyze Returns** tab
-                2. Current prices are **auto-filled from TEFAS** data
-                3. Click "Update TEFAS Prices" to refresh latest prices
-                4. Click "Calculate Real Gains"
-                
-                ---
-                
-                ## TEFAS Integration
-                
-                This app automatically fetches fund prices from [TEFAS](https://www.tefas.gov.tr/):
-                - **Buy prices** are looked up based on transaction date
-                - **Current prices** are auto-filled in the analysis tab
-                - Historical data up to 5 years is fetched for new funds
-                
-                **Supported funds:** All funds listed on TEFAS (mutual funds, pension funds, ETFs)
-                
-                ---
-                
-                ## USD/TRY Rate Management
-                
-                All USD/TRY rates are stored in the local database:
-                - Click **"Refresh All USD Rates"** to fetch all rates from your earliest transaction to today
-                - Rates are fetched from Yahoo Finance (USDTRY=X ticker)
-                - Once fetched, rates are stored locally and used for all calculations
-                - Charts and analysis use the database rates (no external calls during analysis)
-                
-                ---
-                
-                ## Understanding Real Returns
-                
-                **Nominal Return:** How much your investment went up/down in TRY terms (after tax).
-                
-                **USD Change:** How much TRY lost value against USD.
-                
-                **Real Return:** Your actual purchasing power gain/loss (after tax).
-                
-                ### Tax Calculation
-                
-                Tax is applied only on **TRY gains** (not losses):
-                - After-tax value = Current Price - (Gain × Tax Rate)
-                - Example: Buy at 0.50, now 0.75, tax 10% → Tax = 0.25 × 10% = 0.025 TRY → After-tax = 0.725 TRY
-                
-                ---
-                
-                ## FIFO Cost Basis Method
-                
-                **FIFO (First In, First Out)** is the standard cost basis method used by Turkish and most international brokerages.
-                
-                **How it works:**
-                1. When you **buy** shares, each purchase becomes a "lot" with its own cost basis
-                2. When you **sell** shares, the **oldest lots are matched first**
-                3. Realized gains/losses are calculated based on the matched lot's original buy price
-                
-                **Example:**
-                - Buy 100 shares @ 10 TRY (Lot 1)
-                - Buy 50 shares @ 15 TRY (Lot 2)
-                - Sell 120 shares @ 20 TRY
-                  - FIFO matches: 100 from Lot 1 + 20 from Lot 2
-                  - Realized gain: (100 × 10) + (20 × 5) = 1,100 TRY
-                  - Remaining: 30 shares from Lot 2 @ 15 TRY
-                
-                **Benefits:**
-                - Accurate cost basis tracking for tax reporting
-                - Separate unrealized (open) and realized (closed) gains
-                - Matches how your broker calculates gains
-                
-                ---
-                
-                ## What is a Benchmark?
-                
-                In finance, a **Benchmark** (Karşılaştırma Ölçütü) is a standard or reference point used to evaluate the performance of a security, mutual fund, or investment manager.
-                
-                **Function:** It serves as a yardstick to determine if an investment is performing better or worse than the general market.
-                
-                **Common Examples:**
-                - **S&P 500** - for US stocks
-                - **BIST 100** - for Turkish stocks
-                - **USD/TRY** - for Turkish inflation (the "street method")
-                - **Official CPI** - for measuring against TCMB inflation data
-                
-                If a fund's benchmark is BIST 100, the fund manager aims to generate returns higher than that index. 
-                
-                **In LiraShield**, we use **USD/TRY** and **Official CPI** as benchmarks to measure your *real* purchasing power gains — because beating nominal inflation is what truly matters.
-                
-                ---
-                
-                ## Data Sources
-                
-                - **Fund Prices**: [TEFAS](https://www.tefas.gov.tr/) (automatic)
-                - **CPI**: [TCMB Consumer Prices](https://www.tcmb.gov.tr/wps/wcm/connect/EN/TCMB+EN/Main+Menu/Statistics/Inflation+Data/Consumer+Prices)
-                - **USD/TRY**: Yahoo Finance (USDTRY=X ticker) - stored in local database
-                
-                The app stores all data in a local SQLite database (`portfolio.db`).
-                """
+            gr.Markdown(_MD_HELP)
+
+        async def load_tables(ticker_filter: str, *paging: float) -> tuple:
+            """Initial table contents and ticker defaults, read concurrently in one page-load request."""
+            tx_args, cpi_args, rate_args = paging[0:2], paging[2:4], paging[4:6]
+            tickers, tx, cpi, rates, prices = await asyncio.gather(
+                asyncio.to_thread(get_unique_tickers),
+                asyncio.to_thread(paged_filter_portfolio, ticker_filter, *tx_args),
+                asyncio.to_thread(paged_refresh_cpi, *cpi_args),
+                asyncio.to_thread(paged_refresh_rates, *rate_args),
+                asyncio.to_thread(get_ticker_price_table),
             )
+            tickers = tickers or []
+            return (
+                gr.update(choices=["All"] + tickers),
+                tx,
+                cpi,
+                rates,
+                prices,
+                # Fund Charts defaults: first ticker for the single chart, first three for the comparison
+                gr.update(choices=tickers or ["No tickers"], value=tickers[0] if tickers else None),
+                ", ".join(tickers[:3]),
+            )
+
+        # Fill tables once the browser connects instead of querying the database while building the UI
+        demo.load(
+            load_tables,
+            inputs=[tx_filter_ticker, *tx_paging, *cpi_paging, *rate_paging],
+            outputs=[tx_filter_ticker, tx_table, cpi_table, rate_table, price_table, chart_ticker, compare_tickers],
+        )
+
+    # Run long handlers (bulk imports, API refreshes) concurrently without blocking each other
+    # Bounded so a burst of clicks is rejected instead of piling up unbounded work
+    demo.queue(default_concurrency_limit=4, max_size=64)
 
     return demo